@@ -3,9 +3,11 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.utils
 import json
-from ekman_calculations import EkmanTransportCalculator
+from ekman_similarity import SimilarityEvaluator
 
 app = Flask(__name__)
+# 요청 간에 단위 해 캐시를 공유하여 같은 위도/깊이의 반복 계산을 생략
+evaluator = SimilarityEvaluator()
 
 @app.route('/')
 def index():
@@ -23,8 +25,8 @@ def calculate_ekman():
     visualization_type = data.get('visualization_type', '3d')
     
     # 에크만 수송 계산
-    calculator = EkmanTransportCalculator()
-    results = calculator.calculate_ekman_transport(
+    calculator = evaluator.calculator
+    results = evaluator.evaluate(
         wind_speed=wind_speed,
         wind_direction=wind_direction,
         latitude=latitude,
@@ -42,7 +44,7 @@ def calculate_ekman():
     
     return jsonify({
         'graph': graph_json,
-        'results': results
+        'results': results.to_dict()
     })
 
 @app.route('/get_parameters')
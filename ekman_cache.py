@@ -0,0 +1,122 @@
+"""
+에크만 계산용 LRU 캐시
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """항목 수(선택적으로 바이트 수)로 크기가 제한되는 LRU(Least Recently Used) 캐시
+
+    조회 적중(hits), 실패(misses), 제거(evictions) 통계를 기록합니다.
+    maxsize가 0이면 캐시를 사용하지 않습니다. maxbytes 를 지정하면 sizeof(value) 의
+    합이 maxbytes 이하가 되도록 오래된 항목부터 제거하며, maxbytes 보다 큰 항목은 저장하지 않습니다.
+    여러 스레드(예: 스레드 웹 서버의 요청)가 공유해도 되도록 내부 잠금으로 보호됩니다.
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=None):
+        if maxsize < 0:
+            raise ValueError(f"maxsize는 0 이상이어야 합니다: {maxsize}")
+        if maxbytes is not None and maxbytes < 0:
+            raise ValueError(f"maxbytes는 0 이상이어야 합니다: {maxbytes}")
+        if maxbytes is not None and sizeof is None:
+            raise ValueError("maxbytes를 지정하려면 sizeof 함수가 필요합니다")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._sizes = {}
+        self.currbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # 잠금은 피클할 수 없으므로 제외 (프로세스 풀로 계산기를 보낼 때)
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """키 조회 (적중 시 가장 최근 사용 항목으로 이동)"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """항목 저장 (용량 초과 시 가장 오래된 항목부터 제거)"""
+        if self.maxsize == 0:
+            return
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            if self.sizeof is not None:
+                if self.maxbytes is not None and size > self.maxbytes:
+                    return
+                self.currbytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        # 호출하는 쪽에서 잠금을 잡은 상태여야 함
+        while len(self._data) > self.maxsize or (self.maxbytes is not None and self.currbytes > self.maxbytes):
+            key, _ = self._data.popitem(last=False)
+            self.currbytes -= self._sizes.pop(key, 0)
+            self.evictions += 1
+
+    def resize(self, maxsize, maxbytes=None):
+        """최대 항목 수 (maxbytes 를 지정하면 최대 바이트 수도) 변경"""
+        if maxsize < 0:
+            raise ValueError(f"maxsize는 0 이상이어야 합니다: {maxsize}")
+        if maxbytes is not None:
+            if maxbytes < 0:
+                raise ValueError(f"maxbytes는 0 이상이어야 합니다: {maxbytes}")
+            if self.sizeof is None:
+                raise ValueError("maxbytes를 지정하려면 sizeof 함수가 필요합니다")
+        with self._lock:
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """모든 항목과 통계 초기화"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.currbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """캐시 통계 딕셔너리"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'currsize': len(self._data),
+                'maxsize': self.maxsize,
+                'currbytes': self.currbytes,
+                'maxbytes': self.maxbytes,
+                'hit_rate': self.hits / total if total else 0.0
+            }
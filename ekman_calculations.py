@@ -1,17 +1,44 @@
+import copy
+
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
 from translations import translations
+from ekman_cache import LRUCache
+from ekman_drag import formulation_signature
+from ekman_result import EkmanTransportResult
+
+OMEGA = 7.2921e-5           # 지구 자전 각속도 (rad/s)
+EQUATORIAL_MODES = (None, 'friction', 'beta')
+SPIRAL_LEVELS = 50          # 에크만 나선 기본 연직 격자 수
+LEVEL_MODES = ('linear', 'log', 'ekman')
+EKMAN_SCALED_EXTENT = 2.0   # 'ekman' 모드의 최대 깊이 (에크만 깊이의 배수, 속도 ≈ e^-2π ≈ 0.2%)
+COMPUTE_DTYPES = (np.float32, np.float64)
+# float32 계산의 float64 대비 상대 오차 한계 (수송량, 응력, 에크만 깊이, 에너지 전달률,
+# 나선 속도의 표층 속도 대비 오차). 각 값은 수 회의 곱셈/나눗셈과 sin/cos/sqrt 로
+# 계산되므로 오차는 단위 반올림 2^-24 ≈ 6e-8 의 수십 배 이내입니다.
+FLOAT32_RTOL = 2e-6
 
 class EkmanTransportCalculator:
-    def __init__(self):
+    def __init__(self, spiral_cache_size=128):
         # 물리 상수
         self.rho_water = 1025  # kg/m³ (해수 밀도)
         self.rho_air = 1.225   # kg/m³ (공기 밀도)
         self.Cd = 0.0013       # 항력 계수
+        self.K = 0.01          # m²/s (일반적인 수직 난류 점성 계수)
+        self.drag_formulation = None  # 항력 공식 (ekman_drag 참고, None이면 상수 Cd)
+        self.dtype = np.float64  # 일괄/격자/나선 계산 정밀도 (np.float32 또는 np.float64)
+        
+        # 적도 처리 (스칼라/일괄/격자 공통): None (위도 0 → 1e-6), 'friction', 'beta'
+        self.equatorial_mode = None
+        self.equatorial_band = 5.0       # 도 (적도 처리 적용 위도 범위 |φ| < band)
+        self.equatorial_friction = None  # 1/s (적도 마찰 r0, None이면 밴드 경계의 |f|)
         self.f = None          # 코리올리 매개변수 (위도에 따라 계산)
         
+        # 에크만 나선 깊이 기저 (exp(-az), cos(az), sin(az)) LRU 캐시
+        self.spiral_basis_cache = LRUCache(maxsize=spiral_cache_size)
+        
     def _set_matplotlib_font(self, lang):
         """언어에 따라 Matplotlib 폰트를 설정합니다."""
         # 언어별 폰트 설정
@@ -33,21 +60,131 @@ class EkmanTransportCalculator:
             plt.rcParams['font.family'] = 'Apple SD Gothic Neo'
             plt.rcParams['axes.unicode_minus'] = False
         
+    def _asarray(self, x, dtype=None):
+        """계산 정밀도(dtype, 기본값 self.dtype)의 배열로 변환
+
+        np.float32 에서는 모든 중간 배열이 float32 로 유지되어 메모리와 대역폭이
+        절반이 되며, float64 대비 상대 오차는 FLOAT32_RTOL 이내입니다.
+        """
+        if dtype is None:
+            dtype = self.dtype
+        if np.dtype(dtype).type not in COMPUTE_DTYPES:
+            raise ValueError(f"지원하지 않는 계산 정밀도입니다: {dtype} (가능: {COMPUTE_DTYPES})")
+        return np.asarray(x, dtype=dtype)
+
+    def _physics(self):
+        """결과 객체의 지연 항목이 쓰는 설정 (rho_water, K, dtype), 결과 생성 시점의 값으로 고정"""
+        return self.rho_water, self.K, self.dtype
+
     def calculate_coriolis_parameter(self, latitude):
         """코리올리 매개변수 계산"""
-        omega = 7.2921e-5  # 지구 자전 각속도 (rad/s)
-        return 2 * omega * np.sin(np.radians(latitude))
-    
-    def calculate_ekman_transport(self, wind_speed, wind_direction, latitude, depth):
-        """에크만 수송 계산"""
-        if latitude == 0:
-            latitude = 1e-6 # 위도가 0일 때 f가 0이 되어 나누기 오류가 발생하는 것을 방지
+        return 2 * OMEGA * np.sin(np.radians(latitude))
 
-        # 코리올리 매개변수 계산
+    def coriolis_and_friction(self, latitude):
+        """코리올리 매개변수 f 와 적도 마찰 r (스칼라 경로는 _scalar_coriolis 참고)
+
+        equatorial_mode 가 None이면 기존과 같이 위도 0을 1e-6으로 바꾸고 r = None.
+        'friction' 은 |φ| < equatorial_band 에서 cos² 모양으로 줄어드는 선형 마찰 r 을,
+        'beta' 는 여기에 더해 밴드 안에서 베타 평면 근사 f = β·y = 2Ω·φ 를 사용합니다.
+        마찰이 있으면 수송량은 M = τ(r + i f) / (ρ(r² + f²)) 로 적도에서도 유한하고,
+        밴드 밖(r = 0)에서는 기존 식 M = iτ/(ρf) 와 같습니다.
+        """
+        mode = self.equatorial_mode
+        if mode not in EQUATORIAL_MODES:
+            raise ValueError(f"지원하지 않는 적도 처리 모드입니다: {mode} (가능: {EQUATORIAL_MODES})")
+        latitude = self._asarray(latitude)
+        if mode is None:
+            # 위도 0 처리 (스칼라 경로와 동일)
+            latitude = np.where(latitude == 0, 1e-6, latitude)
+            return self.calculate_coriolis_parameter(latitude), None
+
+        band = self.equatorial_band
+        in_band = np.abs(latitude) < band
         f = self.calculate_coriolis_parameter(latitude)
-        
+        if mode == 'beta':
+            f = np.where(in_band, 2 * OMEGA * np.radians(latitude), f)
+        taper = np.cos(0.5 * np.pi * np.minimum(np.abs(latitude) / band, 1.0)) ** 2
+        r = np.where(in_band, self._equatorial_friction_scale() * taper, 0.0)
+        return f, r
+
+    def _scalar_coriolis(self, latitude):
+        """스칼라 경로의 (위도, f, r): 적도 처리는 coriolis_and_friction 과 같음"""
+        if self.equatorial_mode is None:
+            if latitude == 0:
+                latitude = 1e-6 # 위도가 0일 때 f가 0이 되어 나누기 오류가 발생하는 것을 방지
+            return latitude, self.calculate_coriolis_parameter(latitude), None
+        f, r = self.coriolis_and_friction(latitude)
+        return latitude, float(f), float(r)
+
+    def _equatorial_friction_scale(self):
+        """적도 마찰 r0 (1/s, 기본값은 밴드 경계의 |f|)"""
+        r0 = self.equatorial_friction
+        if r0 is None:
+            r0 = abs(self.calculate_coriolis_parameter(self.equatorial_band))
+        # NumPy 스칼라는 배열 정밀도를 올리므로 파이썬 float 으로 사용
+        return float(r0)
+
+    def coriolis_and_friction_gradient(self, latitude):
+        """coriolis_and_friction 의 위도에 대한 도함수 (df/dφ, dr/dφ), 단위 1/s/도
+
+        equatorial_mode 가 None이면 dr/dφ 는 None 입니다.
+        """
+        latitude = self._asarray(latitude)
+        per_degree = np.pi / 180
+        df = 2 * OMEGA * per_degree * np.cos(np.radians(latitude))
+        if self.equatorial_mode is None:
+            return df, None
+
+        band = self.equatorial_band
+        in_band = np.abs(latitude) < band
+        if self.equatorial_mode == 'beta':
+            df = np.where(in_band, 2 * OMEGA * per_degree, df)
+        # d/dφ cos²(π|φ|/2b) = -sin(π|φ|/b)·π/(2b)·sgn(φ)
+        slope = np.sin(np.pi * np.minimum(np.abs(latitude) / band, 1.0)) * np.sign(latitude)
+        dr = np.where(in_band, -self._equatorial_friction_scale() * 0.5 * np.pi / band * slope, 0.0)
+        return df, dr
+    
+    def settings(self):
+        """결과에 영향을 주는 물리 설정 (JSON 직렬화 가능, 체크포인트/캐시 키 비교용)"""
+        return {
+            'rho_water': float(self.rho_water),
+            'rho_air': float(self.rho_air),
+            'Cd': float(self.Cd),
+            'K': float(self.K),
+            'dtype': np.dtype(self.dtype).str,
+            'equatorial_mode': self.equatorial_mode,
+            'equatorial_band': float(self.equatorial_band),
+            'equatorial_friction': None if self.equatorial_friction is None else float(self.equatorial_friction),
+            'drag_formulation': formulation_signature(self.drag_formulation),
+        }
+
+    def subset(self, index, shape):
+        """전체 입력 shape 의 index 부분(타일/청크)을 계산할 계산기
+
+        항력 공식이 격자 자료를 가지면(예: 기온 장을 받은 BulkStabilityDrag) 같은 부분으로
+        잘라 낸 공식을 쓰는 얕은 복사본을, 아니면 자신을 반환합니다.
+        """
+        subset = getattr(self.drag_formulation, 'subset', None)
+        if subset is None:
+            return self
+        drag_formulation = subset(index, shape)
+        if drag_formulation is self.drag_formulation:
+            return self
+        calc = copy.copy(self)
+        calc.drag_formulation = drag_formulation
+        return calc
+
+    def drag_coefficients(self, wind_speed):
+        """바람 속도에 대한 (공기 밀도, 항력 계수)"""
+        if self.drag_formulation is None:
+            return self.rho_air, self.Cd
+        return self.drag_formulation.coefficients(wind_speed, self.rho_air)
+
+    def _wind_stress_components(self, wind_speed, wind_direction):
+        """바람 속도/방향으로부터 바람 응력과 x, y 성분 계산"""
         # 바람 응력 계산
-        wind_stress = self.rho_air * self.Cd * wind_speed**2
+        rho_air, Cd = self.drag_coefficients(wind_speed)
+        wind_stress = rho_air * Cd * wind_speed**2
         
         # 바람 방향을 라디안으로 변환
         wind_direction_rad = np.radians(wind_direction)
@@ -55,56 +192,244 @@ class EkmanTransportCalculator:
         # 바람 응력의 x, y 성분
         tau_x = wind_stress * np.cos(wind_direction_rad)
         tau_y = wind_stress * np.sin(wind_direction_rad)
-        
+        return wind_stress, tau_x, tau_y
+
+    def _wind_stress_from_components(self, u, v):
+        """바람 성분 u, v 로부터 바람 속도, 바람 응력과 x, y 성분 (격자/관측소 경로 공통)"""
+        # 벌크 공식: τ = ρa·Cd·|U|·(u, v)
+        wind_speed = np.hypot(u, v)
+        rho_air, Cd = self.drag_coefficients(wind_speed)
+        stress_per_speed = rho_air * Cd * wind_speed
+        return wind_speed, stress_per_speed * wind_speed, stress_per_speed * u, stress_per_speed * v
+
+    def _transport_from_stress(self, tau_x, tau_y, f, r=None):
+        """바람 응력과 코리올리 매개변수로부터 에크만 수송 및 에크만 깊이 계산"""
+        if r is not None:
+            # 적도 마찰 정규화: M = τ(r + i f) / (ρ(r² + f²))
+            f_squared = f * f + r * r
+            denominator = self.rho_water * f_squared
+            Mx = (r * tau_x - f * tau_y) / denominator
+            My = (r * tau_y + f * tau_x) / denominator
+            ekman_depth = np.pi * np.sqrt(2 * self.K / np.sqrt(f_squared))
+            return Mx, My, ekman_depth
+
         # 에크만 수송 계산 (Ekman, 1905)
         # Mx = -τy / (ρf), My = τx / (ρf)
         Mx = -tau_y / (self.rho_water * f)
         My = tau_x / (self.rho_water * f)
         
-        # 에크만 깊이 및 표층 해류 계산을 위한 상수
-        K = 0.01  # m²/s (일반적인 수직 난류 점성 계수)
-        ekman_depth = np.pi * np.sqrt(2 * K / abs(f))
-        
-        # 수직 속도 프로파일 생성 (에크만 나선)
-        z_levels = np.linspace(0, depth, 50)
-        ekman_spiral = self.calculate_ekman_spiral(z_levels, tau_x, tau_y, f, K)
+        # 에크만 깊이
+        ekman_depth = np.pi * np.sqrt(2 * self.K / np.abs(f))
+        return Mx, My, ekman_depth
+
+    def _surface_energy_transfer(self, tau_x, tau_y, f, r=None, K=None, rho_water=None):
+        """표층 해류를 닫힌 식으로 계산한 에너지 전달률 (W/m^2, K·rho_water 기본값은 현재 설정)"""
+        K = self.K if K is None else K
+        rho_water = self.rho_water if rho_water is None else rho_water
+        f_magnitude = np.abs(f) if r is None else np.sqrt(f * f + r * r)
+        # z=0에서 exp(0)=1, cos(0)=1, sin(0)=0 이므로 u0 = c·τx, v0 = c·τy
+        surface_factor = 1.0 / (rho_water * np.sqrt(2 * K * f_magnitude))
+        return tau_x * (surface_factor * tau_x) + tau_y * (surface_factor * tau_y)
+
+    def make_z_levels(self, depth, ekman_depth, levels=None, mode='linear', cutoff_tol=None, dtype=None):
+        """에크만 나선 연직 격자 생성
+
+        Args:
+            depth: 최대 깊이 (m)
+            ekman_depth: 에크만 깊이 (m)
+            levels: 격자 수(정수, 기본값 50) 또는 명시적 깊이 배열 (m, 0 이상 오름차순)
+            mode: 'linear' (0~depth 등간격), 'log' (표층에 조밀한 로그 간격),
+                'ekman' (0~2×에크만 깊이 등간격, depth 이내). 깊이가 0이면 모두 0인 격자
+            cutoff_tol: 표층 대비 속도 비율 허용치 (0 < tol < 1). 속도는 exp(-πz/D_E)로 감쇠하므로
+                z = D_E·ln(1/tol)/π 보다 깊은 곳은 샘플링하지 않음
+            dtype: 격자 정밀도 (기본값: self.dtype)
+
+        기본값은 기존과 같은 np.linspace(0, depth, 50) 입니다.
+        """
+        dtype = self._asarray(0, dtype).dtype
+        if levels is not None and np.ndim(levels) > 0:
+            z_levels = np.asarray(levels, dtype=dtype)
+            if z_levels.ndim != 1 or np.any(z_levels < 0) or np.any(np.diff(z_levels) <= 0):
+                raise ValueError("명시적 깊이 격자는 0 이상의 오름차순 1차원 배열이어야 합니다")
+            return z_levels
+        if mode not in LEVEL_MODES:
+            raise ValueError(f"지원하지 않는 격자 모드입니다: {mode} (가능: {LEVEL_MODES})")
+
+        n = SPIRAL_LEVELS if levels is None else int(levels)
+        if n < 2:
+            raise ValueError(f"격자 수는 2 이상이어야 합니다: {levels}")
+        if cutoff_tol is not None and not 0 < cutoff_tol < 1:
+            raise ValueError(f"cutoff_tol은 0과 1 사이여야 합니다: {cutoff_tol}")
+        if depth < 0:
+            raise ValueError(f"최대 깊이는 0 이상이어야 합니다: {depth}")
+        bottom = depth
+        if mode == 'ekman':
+            bottom = min(bottom, EKMAN_SCALED_EXTENT * ekman_depth)
+        if cutoff_tol is not None:
+            # e-folding 차단: exp(-πz/D_E) = tol
+            bottom = min(bottom, ekman_depth * np.log(1 / cutoff_tol) / np.pi)
+
+        if mode == 'log' and bottom > 0:
+            first = min(bottom, ekman_depth) * 1e-2
+            return np.concatenate((np.zeros(1, dtype=dtype), np.geomspace(first, bottom, n - 1, dtype=dtype)))
+        return np.linspace(0, bottom, n, dtype=dtype)
+
+    def calculate_ekman_transport(self, wind_speed, wind_direction, latitude, depth,
+                                  levels=None, level_mode='linear', cutoff_tol=None):
+        """에크만 수송 계산
+
+        levels, level_mode, cutoff_tol 은 에크만 나선 연직 격자 설정입니다
+        (make_z_levels 참고).
+        """
+        # 코리올리 매개변수와 적도 마찰 (equatorial_mode, 일괄/격자 경로와 같은 처리)
+        latitude, f, r = self._scalar_coriolis(latitude)
+        
+        # 바람 응력 및 x, y 성분
+        wind_stress, tau_x, tau_y = self._wind_stress_components(wind_speed, wind_direction)
+        
+        # 에크만 수송 및 에크만 깊이
+        Mx, My, ekman_depth = self._transport_from_stress(tau_x, tau_y, f, r)
+        
+        # 에크만 나선(z_levels, ekman_spiral)과 표층 해류 기반 에너지 전달률은
+        # 결과 객체에서 처음 접근할 때 계산됨
+        return EkmanTransportResult(self, self._physics(), (levels, level_mode, cutoff_tol),
+                                    wind_speed, wind_direction, latitude, depth,
+                                    wind_stress, tau_x, tau_y, Mx, My, ekman_depth, f, r)
+
+    def calculate_ekman_transport_batch(self, wind_speed, wind_direction, latitude, depth, sensitivities=False):
+        """에크만 수송 일괄 계산 (배열 입력, 브로드캐스팅)
+
+        입력은 NumPy 배열 또는 브로드캐스트 가능한 스칼라이며, 결과는 배열 딕셔너리
+        (struct-of-arrays)로 반환합니다. 에크만 나선은 만들지 않고 표층 해류(z=0)만
+        닫힌 식으로 계산하므로 스칼라 경로와 같은 값을 한 번의 연산으로 얻습니다.
+        입력은 self.dtype 으로 변환되며 결과 배열도 같은 정밀도입니다.
+
+        sensitivities=True 이면 Mx, My, ekman_depth 의 해석적 편미분
+        'd<항목>_d<변수>' (변수: wind_speed, wind_direction, latitude, Cd, K)를
+        함께 반환합니다 (_transport_sensitivities 참고).
+        """
+        wind_speed, wind_direction, latitude, depth = np.broadcast_arrays(
+            *(self._asarray(x) for x in (wind_speed, wind_direction, latitude, depth))
+        )
+
+        # 적도 처리 (equatorial_mode, 기본값은 스칼라 경로와 같이 위도 0 → 1e-6)
+        f, r = self.coriolis_and_friction(latitude)
+
+        wind_stress, tau_x, tau_y = self._wind_stress_components(wind_speed, wind_direction)
+        Mx, My, ekman_depth = self._transport_from_stress(tau_x, tau_y, f, r)
+
+        energy_transfer_rate = self._surface_energy_transfer(tau_x, tau_y, f, r)
 
-        # 표층 해류 속도 (z=0)
-        u_surface = ekman_spiral['u'][0]
-        v_surface = ekman_spiral['v'][0]
-        
-        # 에너지 전달률 계산 (단위 면적당 일률, W/m^2)
-        energy_transfer_rate = tau_x * u_surface + tau_y * v_surface
-        
         results = {
-            'wind_speed': wind_speed,
-            'wind_direction': wind_direction,
-            'latitude': latitude,
-            'depth': depth,
             'wind_stress': wind_stress,
             'tau_x': tau_x,
             'tau_y': tau_y,
             'Mx': Mx,
             'My': My,
             'ekman_depth': ekman_depth,
-            'z_levels': z_levels,
-            'ekman_spiral': ekman_spiral,
             'f': f,
             'energy_transfer_rate': energy_transfer_rate
         }
-        
+        if sensitivities:
+            results.update(self._transport_sensitivities(wind_speed, wind_direction, latitude, Mx, My, ekman_depth, f, r))
         return results
+
+    def _transport_sensitivities(self, wind_speed, wind_direction, latitude, Mx, My, ekman_depth, f, r):
+        """에크만 수송과 에크만 깊이의 닫힌 식 편미분
+
+        M = Mx + iMy = τ/(ρλ), λ = r - i f, τ = ρa·Cd·U²·e^{iθ} 이므로
+            ∂M/∂U = 2ρa·Cd·U·e^{iθ}/(ρλ),  ∂M/∂θ = iM,  ∂M/∂Cd = M/Cd,  ∂M/∂K = 0,
+            ∂M/∂φ = -M·λ'/λ,  D_E ∝ √K·(r² + f²)^(-1/4)
+        입니다 (r = 0 이면 기존 식 M = iτ/(ρf)). 각도(θ, φ)에 대한 도함수는 1/도 단위입니다.
+        """
+        if self.drag_formulation is not None:
+            raise ValueError("편미분은 상수 항력 계수(drag_formulation=None)에서만 계산할 수 있습니다")
+        df, dr = self.coriolis_and_friction_gradient(latitude)
+        if r is None:
+            r, dr = 0.0, 0.0
+        per_degree = np.pi / 180
+        friction_squared = r * r + f * f
+
+        # 바람 속도: dτ/dU = 2ρa·Cd·U·(cosθ, sinθ)
+        wind_direction_rad = np.radians(wind_direction)
+        stress_slope = 2 * self.rho_air * self.Cd * wind_speed / (self.rho_water * friction_squared)
+        slope_x = stress_slope * np.cos(wind_direction_rad)
+        slope_y = stress_slope * np.sin(wind_direction_rad)
+
+        # 위도: λ'/λ = a + ib, a = (r r' + f f')/(r² + f²), b = (r' f - f' r)/(r² + f²)
+        a = (r * dr + f * df) / friction_squared
+        b = (dr * f - df * r) / friction_squared
+
+        zero = np.zeros((), dtype=Mx.dtype)
+        return {
+            'dMx_dwind_speed': r * slope_x - f * slope_y,
+            'dMy_dwind_speed': r * slope_y + f * slope_x,
+            'dMx_dwind_direction': -My * per_degree,
+            'dMy_dwind_direction': Mx * per_degree,
+            'dMx_dlatitude': My * b - Mx * a,
+            'dMy_dlatitude': -(Mx * b + My * a),
+            'dMx_dCd': Mx / self.Cd,
+            'dMy_dCd': My / self.Cd,
+            'dMx_dK': np.broadcast_to(zero, Mx.shape),
+            'dMy_dK': np.broadcast_to(zero, My.shape),
+            'dekman_depth_dwind_speed': np.broadcast_to(zero, ekman_depth.shape),
+            'dekman_depth_dwind_direction': np.broadcast_to(zero, ekman_depth.shape),
+            'dekman_depth_dlatitude': -0.5 * ekman_depth * a,
+            'dekman_depth_dCd': np.broadcast_to(zero, ekman_depth.shape),
+            'dekman_depth_dK': ekman_depth / (2 * self.K),
+        }
     
-    def calculate_ekman_spiral(self, z_levels, tau_x, tau_y, f, K):
-        """에크만 나선 계산"""
-        # a = sqrt(|f| / 2K)
-        a = np.sqrt(abs(f) / (2 * K))
+    def _spiral_basis(self, z_levels, f, K, dtype=None, r=None):
+        """에크만 나선의 깊이 기저 exp(-az), cos(bz), sin(bz) 계산 (LRU 캐시 사용)
+
+        기저는 위도(f, 적도 마찰 r), 난류 점성 계수(K), 깊이 격자에만 의존하므로
+        (f, K, r, 깊이 격자)를 키로 캐시합니다. r 이 None이면 a = b = sqrt(|f| / 2K) 입니다.
+        """
+        z_levels = self._asarray(z_levels, dtype)
+        cacheable = np.ndim(f) == 0 and np.ndim(K) == 0 and np.ndim(r) == 0
+        if cacheable:
+            key = (float(f), float(K), None if r is None else float(r),
+                   z_levels.dtype.str, z_levels.shape, z_levels.tobytes())
+            basis = self.spiral_basis_cache.get(key)
+            if basis is not None:
+                return basis
+
+        if r is None:
+            # a = sqrt(|f| / 2K) (깊이 격자의 정밀도로 계산)
+            a = b = np.sqrt(abs(self._asarray(f, z_levels.dtype)) / (2 * K))
+        else:
+            # 적도 마찰: 감쇠 a 와 회전 b 는 sqrt((r - i f)/K) 의 실수부와 허수부 크기
+            f, r = (self._asarray(x, z_levels.dtype) for x in (f, r))
+            magnitude = np.sqrt(f * f + r * r)
+            a = np.sqrt((magnitude + r) / (2 * K))
+            b = np.sqrt((magnitude - r) / (2 * K))
+        basis = (np.exp(-a * z_levels), np.cos(b * z_levels), np.sin(b * z_levels))
+
+        if cacheable:
+            for array in basis:
+                array.setflags(write=False)
+            self.spiral_basis_cache.put(key, basis)
+        return basis
+
+    def calculate_ekman_spiral(self, z_levels, tau_x, tau_y, f, K, rho_water=None, dtype=None, r=None):
+        """에크만 나선 계산 (dtype 정밀도, rho_water·dtype 기본값은 현재 설정)
+
+        r 은 적도 마찰 (coriolis_and_friction)이며, 표층 속도 크기는 |f| 대신
+        sqrt(f² + r²) 로 정해져 _surface_energy_transfer 와 일치합니다.
+        """
+        rho_water = self.rho_water if rho_water is None else rho_water
+        decay, cos_az, sin_az = self._spiral_basis(z_levels, f, K, dtype, r)
+        tau_x, tau_y, f = (self._asarray(x, dtype) for x in (tau_x, tau_y, f))
+        if r is None:
+            f_magnitude = abs(f)
+        else:
+            r = self._asarray(r, dtype)
+            f_magnitude = np.sqrt(f * f + r * r)
         
         # 공통 계수
-        factor = np.exp(-a * z_levels) / (self.rho_water * np.sqrt(2 * K * abs(f)))
+        factor = decay / (rho_water * np.sqrt(2 * K * f_magnitude))
         
         # 속도 성분
-        cos_az, sin_az = np.cos(a * z_levels), np.sin(a * z_levels)
         sgn_f = np.sign(f)
         
         u = factor * (tau_x * cos_az - sgn_f * tau_y * sin_az)
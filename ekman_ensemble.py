@@ -0,0 +1,129 @@
+"""
+물리 상수(Cd, K, 해수/공기 밀도) 불확실성에 대한 앙상블(몬테카를로) 에크만 수송 계산
+
+상수 표본을 (표본, 1) 배열로 계산기에 넣어 일괄 커널에 표본 축을 추가하고,
+격자점 블록마다 (표본 × 블록) 배열만 만들어 평균, 표준편차, 분위수를 구합니다.
+전체 (표본 × 격자점) 배열은 만들지 않습니다.
+"""
+
+import copy
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+ENSEMBLE_PARAMETERS = ('Cd', 'K', 'rho_water', 'rho_air')
+# sample_parameters 의 기본 상대 표준편차 (Cd, K 는 로그정규, 밀도는 정규 분포)
+DEFAULT_UNCERTAINTY = {'Cd': 0.2, 'K': 0.5, 'rho_water': 0.002, 'rho_air': 0.02}
+LOGNORMAL_PARAMETERS = ('Cd', 'K')
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+DEFAULT_BLOCK_ELEMENTS = 2 ** 20  # 블록당 (표본 × 격자점) 원소 수
+
+
+class EkmanEnsemble:
+    """상수 표본 앙상블에 대한 에크만 수송 통계 계산
+
+    Args:
+        calculator: 기준 EkmanTransportCalculator (표본이 없는 상수는 이 값을 사용)
+        block_elements: 한 번에 계산하는 (표본 × 격자점) 원소 수의 상한
+    """
+
+    def __init__(self, calculator=None, block_elements=DEFAULT_BLOCK_ELEMENTS):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.block_elements = block_elements
+
+    def sample_parameters(self, n_samples, uncertainty=None, seed=None):
+        """기준 계산기 상수 주변의 무작위 표본 생성
+
+        Args:
+            n_samples: 표본 수
+            uncertainty: {상수 이름: 상대 표준편차} (기본값 DEFAULT_UNCERTAINTY)
+            seed: 난수 시드 또는 np.random.Generator
+
+        Returns:
+            dict: {상수 이름: shape (n_samples,) 배열}. Cd, K 는 중앙값이 기준값인
+            로그정규 분포(항상 양수), 밀도는 평균이 기준값인 정규 분포입니다.
+        """
+        uncertainty = DEFAULT_UNCERTAINTY if uncertainty is None else uncertainty
+        rng = np.random.default_rng(seed)
+        samples = {}
+        for name, spread in uncertainty.items():
+            if name not in ENSEMBLE_PARAMETERS:
+                raise ValueError(f"지원하지 않는 앙상블 상수입니다: {name} (가능: {ENSEMBLE_PARAMETERS})")
+            center = getattr(self.calculator, name)
+            if name in LOGNORMAL_PARAMETERS:
+                samples[name] = center * np.exp(spread * rng.standard_normal(n_samples))
+            else:
+                samples[name] = center * (1 + spread * rng.standard_normal(n_samples))
+        return samples
+
+    def _sample_calculator(self, parameters):
+        """상수 표본을 (표본, 1) 배열로 가진 계산기 복사본과 표본 수"""
+        sizes = {np.size(values) for values in parameters.values()}
+        if len(sizes) != 1:
+            raise ValueError(f"상수 표본의 길이가 서로 다릅니다: { {k: np.size(v) for k, v in parameters.items()} }")
+        calc = copy.copy(self.calculator)
+        for name, values in parameters.items():
+            if name not in ENSEMBLE_PARAMETERS:
+                raise ValueError(f"지원하지 않는 앙상블 상수입니다: {name} (가능: {ENSEMBLE_PARAMETERS})")
+            values = calc._asarray(values).reshape(-1, 1)
+            if np.any(values <= 0):
+                raise ValueError(f"{name} 표본은 양수여야 합니다")
+            setattr(calc, name, values)
+        if 'Cd' in parameters and calc.drag_formulation is not None:
+            raise ValueError("Cd 표본은 상수 항력 계수(drag_formulation=None)에서만 사용할 수 있습니다")
+        return calc, sizes.pop()
+
+    def run(self, wind_speed, wind_direction, latitude, depth=100.0, parameters=None,
+            fields=('Mx', 'My', 'ekman_depth'), quantiles=DEFAULT_QUANTILES):
+        """앙상블 통계 계산
+
+        Args:
+            wind_speed, wind_direction, latitude, depth: calculate_ekman_transport_batch 와
+                같은 (브로드캐스트 가능한) 입력
+            parameters: {상수 이름: shape (n_samples,) 배열} (기본값 sample_parameters(1000))
+            fields: 통계를 구할 일괄 계산 결과 항목
+            quantiles: 분위수 (0~1)
+
+        Returns:
+            dict: {항목: {'mean', 'std', 'quantiles'}}. 'mean', 'std'(표본 표준편차,
+            ddof=1)는 입력 shape, 'quantiles' 는 (len(quantiles),) + 입력 shape
+        """
+        if parameters is None:
+            parameters = self.sample_parameters(1000)
+        calc, n_samples = self._sample_calculator(parameters)
+        quantiles = np.asarray(quantiles, dtype=float)
+        dtype = calc._asarray(0).dtype
+
+        inputs = np.broadcast_arrays(*(calc._asarray(x) for x in (wind_speed, wind_direction, latitude, depth)))
+        shape = inputs[0].shape
+        flat = [x.reshape(-1) for x in inputs]
+        n_points = flat[0].size
+        block = max(1, self.block_elements // n_samples)
+
+        stats = {
+            field: {'mean': np.empty(n_points, dtype=dtype),
+                    'std': np.empty(n_points, dtype=dtype),
+                    'quantiles': np.empty((quantiles.size, n_points), dtype=dtype)}
+            for field in fields
+        }
+        for start in range(0, n_points, block):
+            stop = min(start + block, n_points)
+            # (표본, 블록) 배열
+            # 항력 공식의 격자 자료도 같은 블록으로 (스칼라 입력은 블록 하나)
+            index = np.unravel_index(np.arange(start, stop), shape) if shape else ()
+            block_calc = calc.subset(index, shape)
+            batch = block_calc.calculate_ekman_transport_batch(*(x[start:stop] for x in flat))
+            for field in fields:
+                if field not in batch:
+                    raise ValueError(f"일괄 계산 결과에 없는 항목입니다: {field}")
+                values = np.broadcast_to(batch[field], (n_samples, stop - start))
+                stats[field]['mean'][start:stop] = values.mean(axis=0)
+                stats[field]['std'][start:stop] = values.std(axis=0, ddof=1) if n_samples > 1 else 0
+                stats[field]['quantiles'][:, start:stop] = np.quantile(values, quantiles, axis=0)
+
+        return {
+            field: {'mean': summary['mean'].reshape(shape),
+                    'std': summary['std'].reshape(shape),
+                    'quantiles': summary['quantiles'].reshape(quantiles.shape + shape)}
+            for field, summary in stats.items()
+        }
@@ -0,0 +1,67 @@
+"""
+격자 바람장(u10/v10)에 대한 에크만 수송 계산 엔진
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+
+class EkmanGridEngine:
+    """2차원 (lat, lon) 또는 3차원 (time, lat, lon) 바람 성분 격자로부터
+    바람 응력과 에크만 수송 장을 계산합니다.
+
+    코리올리 매개변수는 위도 벡터에 대해 행(row)마다 한 번만 계산되어
+    경도/시간 축으로 브로드캐스트됩니다.
+    """
+
+    def __init__(self, calculator=None):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+
+    def coriolis_rows(self, latitude):
+        """위도 벡터에 대한 행별 코리올리 매개변수 (shape: (ny,))"""
+        return self.calculator.coriolis_and_friction(latitude)[0]
+
+    def compute(self, u, v, latitude, index=None, shape=None):
+        """u, v 바람 성분 격자로부터 에크만 수송 장 계산
+
+        Args:
+            u, v: 동서/남북 바람 성분 (m/s), shape (..., ny, nx)
+            latitude: 위도 벡터 (도), shape (ny,)
+            index, shape: u, v 가 shape 격자의 index 부분(타일/청크)일 때 지정하면
+                항력 공식의 격자 자료도 같은 부분으로 잘라 사용 (calculator.subset)
+
+        Returns:
+            dict: 'wind_speed', 'wind_stress', 'tau_x', 'tau_y', 'Mx', 'My',
+            'energy_transfer_rate' 는 입력과 같은 shape, 'f' 와 'ekman_depth' 는
+            위도에만 의존하므로 shape (ny,). 모든 배열은 calculator.dtype 정밀도
+        """
+        calc = self.calculator if index is None else self.calculator.subset(index, shape)
+        u = calc._asarray(u)
+        v = calc._asarray(v)
+        latitude = calc._asarray(latitude)
+        if u.shape != v.shape:
+            raise ValueError(f"u와 v의 shape이 다릅니다: {u.shape} != {v.shape}")
+        if u.ndim < 2 or latitude.shape != (u.shape[-2],):
+            raise ValueError(f"위도 벡터의 길이가 격자 행 수와 맞지 않습니다: {latitude.shape} vs {u.shape}")
+
+        # 행별 코리올리 매개변수와 적도 마찰 (calculator.equatorial_mode)
+        f, r = calc.coriolis_and_friction(latitude)
+        f_rows = f[:, np.newaxis]
+        r_rows = None if r is None else r[:, np.newaxis]
+
+        wind_speed, wind_stress, tau_x, tau_y = calc._wind_stress_from_components(u, v)
+
+        Mx, My, ekman_depth = calc._transport_from_stress(tau_x, tau_y, f_rows, r_rows)
+        energy_transfer_rate = calc._surface_energy_transfer(tau_x, tau_y, f_rows, r_rows)
+
+        return {
+            'wind_speed': wind_speed,
+            'wind_stress': wind_stress,
+            'tau_x': tau_x,
+            'tau_y': tau_y,
+            'Mx': Mx,
+            'My': My,
+            'f': f,
+            'ekman_depth': ekman_depth[:, 0],
+            'energy_transfer_rate': energy_transfer_rate
+        }
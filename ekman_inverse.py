@@ -0,0 +1,97 @@
+"""
+목표 에크만 수송량을 만드는 바람(속도, 방향)을 구하는 역계산 (벡터화)
+
+수송식 M = Mx + iMy = τ/(ρλ), λ = r - i f (r = 0 이면 M = iτ/(ρf)) 를 뒤집으면
+τ = ρ(r - i f)M 이고, 바람 방향은 τ 의 방향, 바람 속도는 |τ| = ρa·Cd·U² 의 해입니다.
+상수 항력 계수에서는 U = √(|τ|/(ρa·Cd)) 로 닫힌 식이며, 바람 속도에 따라 변하는
+항력 공식(ekman_drag)에서는 ln(ρa·Cd·U²) = ln|τ| 에 대한 벡터화 뉴턴 반복을 사용합니다.
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+DEFAULT_RTOL = 1e-10   # 응력 상대 허용 오차
+DEFAULT_MAX_ITER = 50
+DERIVATIVE_STEP = 1e-6  # 항력 도함수 수치 차분의 상대 간격
+
+
+class EkmanInverseSolver:
+    """목표 에크만 수송량에 대한 바람 역계산
+
+    Args:
+        calculator: 상수, 항력 공식, 적도 처리 설정을 제공하는 EkmanTransportCalculator
+        rtol: 뉴턴 반복의 응력 상대 허용 오차
+        max_iter: 뉴턴 반복 최대 횟수
+    """
+
+    def __init__(self, calculator=None, rtol=DEFAULT_RTOL, max_iter=DEFAULT_MAX_ITER):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.rtol = rtol
+        self.max_iter = max_iter
+
+    def required_stress(self, Mx, My, latitude):
+        """목표 수송량을 만드는 바람 응력 (tau_x, tau_y) (N/m²)"""
+        calc = self.calculator
+        Mx, My, latitude = np.broadcast_arrays(*(calc._asarray(x) for x in (Mx, My, latitude)))
+        f, r = calc.coriolis_and_friction(latitude)
+        if r is None:
+            r = 0.0
+        # τ = ρ(r - i f)(Mx + iMy)
+        tau_x = calc.rho_water * (r * Mx + f * My)
+        tau_y = calc.rho_water * (r * My - f * Mx)
+        return tau_x, tau_y
+
+    def wind_speed_for_stress(self, wind_stress):
+        """ρa·Cd(U)·U² = wind_stress 를 만족하는 바람 속도와 수렴 여부"""
+        calc = self.calculator
+        wind_stress = calc._asarray(wind_stress)
+        if calc.drag_formulation is None:
+            wind_speed = np.sqrt(wind_stress / (calc.rho_air * calc.Cd))
+            return wind_speed, np.ones(wind_speed.shape, dtype=bool)
+
+        # 초기값: 기본 상수 항력 계수에 대한 닫힌 해
+        positive = wind_stress > 0
+        log_target = np.log(np.where(positive, wind_stress, 1.0))
+        wind_speed = np.sqrt(wind_stress / (calc.rho_air * calc.Cd))
+        wind_speed = np.where(positive, wind_speed, 1.0)
+        converged = ~positive
+        # float32 계산에서는 반올림 오차보다 작은 허용 오차를 쓰지 않음
+        tolerance = max(self.rtol, 8 * np.finfo(wind_stress.dtype).eps)
+        for _ in range(self.max_iter):
+            # h(U) = ln(ρa·Cd·U²) - ln|τ|, h'(U) = 2/U + d ln(ρa·Cd)/dU
+            log_drag = self._log_drag(wind_speed)
+            residual = log_drag + 2 * np.log(wind_speed) - log_target
+            converged = converged | (np.abs(residual) < tolerance)
+            if np.all(converged):
+                break
+            step = DERIVATIVE_STEP * wind_speed
+            slope = 2 / wind_speed + (self._log_drag(wind_speed + step) - self._log_drag(wind_speed - step)) / (2 * step)
+            update = np.where(converged, 0.0, residual / slope)
+            # 음수로 넘어가지 않도록 한 번에 절반 이상 줄이지 않음
+            wind_speed = np.maximum(wind_speed - update, 0.5 * wind_speed)
+        return np.where(positive, wind_speed, 0.0), converged
+
+    def _log_drag(self, wind_speed):
+        rho_air, Cd = self.calculator.drag_coefficients(wind_speed)
+        return np.log(rho_air * Cd)
+
+    def solve(self, Mx, My, latitude):
+        """목표 수송량 Mx, My (m²/s) 와 위도 (도) 배열에 대한 바람 역계산
+
+        Returns:
+            dict: 'wind_speed' (m/s), 'wind_direction' (도, 0~360, 수송 계산의 바람 방향과
+            같은 규약), 'wind_stress', 'tau_x', 'tau_y' (N/m²), 'converged' (뉴턴 반복
+            수렴 여부, 상수 항력 계수에서는 항상 True)
+        """
+        tau_x, tau_y = self.required_stress(Mx, My, latitude)
+        wind_stress = np.hypot(tau_x, tau_y)
+        wind_speed, converged = self.wind_speed_for_stress(wind_stress)
+        wind_direction = np.mod(np.degrees(np.arctan2(tau_y, tau_x)), 360)
+        return {
+            'wind_speed': wind_speed,
+            'wind_direction': wind_direction,
+            'wind_stress': wind_stress,
+            'tau_x': tau_x,
+            'tau_y': tau_y,
+            'converged': converged
+        }
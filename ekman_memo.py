@@ -0,0 +1,121 @@
+"""
+calculate_ekman_transport 메모이제이션 (입력 양자화 + 항목 수/바이트 제한 LRU)
+
+웹/GUI 에서는 슬라이더 눈금(0.1 m/s, 1°)이나 지점 프리셋 때문에 같은 시나리오가
+반복해서 계산됩니다. MemoizedEkmanCalculator 는 입력을 설정한 간격으로 양자화(반올림)한
+값을 키로 결과를 캐시하며, 양자화된 값으로 계산하므로 같은 키의 결과는 항상 같습니다.
+캐시된 결과는 여러 호출자가 공유하므로 FrozenEkmanTransportResult (읽기 전용)로 반환합니다.
+
+캐시는 스레드 간에 공유해도 됩니다 (LRUCache 내부 잠금, 예: Streamlit 세션 스레드).
+계산기를 감싸는 선택적 래퍼로, calculate_ekman_transport 외의 속성/메서드
+(시각화 등)는 감싼 계산기로 그대로 전달됩니다.
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+from ekman_cache import LRUCache
+from ekman_result import FrozenEkmanTransportResult
+
+# 입력별 양자화 간격 (None이면 양자화하지 않고 값 그대로 키로 사용)
+DEFAULT_QUANTIZATION = {
+    'wind_speed': 0.1,      # m/s
+    'wind_direction': 1.0,  # 도
+    'latitude': 0.1,        # 도
+    'depth': 1.0,           # m
+}
+DEFAULT_MEMO_SIZE = 1024
+DEFAULT_MEMO_BYTES = 16 * 2 ** 20
+RESULT_OVERHEAD_BYTES = 512  # 결과 객체와 스칼라 항목의 대략적인 크기
+
+
+def result_nbytes(result):
+    """캐시 항목(FrozenEkmanTransportResult)의 대략적인 메모리 사용량 (바이트)"""
+    spiral = result.ekman_spiral
+    return RESULT_OVERHEAD_BYTES + result.z_levels.nbytes + sum(np.asarray(value).nbytes for value in spiral.values())
+
+
+class MemoizedEkmanCalculator:
+    """양자화된 입력을 키로 calculate_ekman_transport 결과를 캐시하는 계산기 래퍼
+
+    Args:
+        calculator: 감쌀 EkmanTransportCalculator
+        quantization: DEFAULT_QUANTIZATION 을 덮어쓸 {입력: 간격} 딕셔너리
+        maxsize: 캐시할 최대 결과 수
+        maxbytes: 캐시할 결과의 최대 총 바이트 수 (None이면 제한 없음)
+    """
+
+    def __init__(self, calculator=None, quantization=None, maxsize=DEFAULT_MEMO_SIZE,
+                 maxbytes=DEFAULT_MEMO_BYTES):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.quantization = dict(DEFAULT_QUANTIZATION)
+        if quantization is not None:
+            unknown = set(quantization) - set(DEFAULT_QUANTIZATION)
+            if unknown:
+                raise ValueError(f"양자화할 수 없는 입력입니다: {sorted(unknown)} (가능: {list(DEFAULT_QUANTIZATION)})")
+            self.quantization.update(quantization)
+        for name, step in self.quantization.items():
+            if step is not None and not step > 0:
+                raise ValueError(f"{name} 양자화 간격은 양수여야 합니다: {step}")
+        self.cache = LRUCache(maxsize=maxsize, maxbytes=maxbytes, sizeof=result_nbytes)
+
+    def __getattr__(self, name):
+        # 시각화 등 나머지 기능은 감싼 계산기로 전달 (생성 전/복사 중에는 재귀하지 않음)
+        if name == 'calculator':
+            raise AttributeError(name)
+        return getattr(self.calculator, name)
+
+    def quantize(self, name, value):
+        """입력 값을 양자화 간격의 배수로 반올림 (키로 쓸 정수 눈금, 반올림한 값)"""
+        step = self.quantization[name]
+        if step is None:
+            return float(value), float(value)
+        index = int(round(value / step))
+        if name == 'wind_direction':
+            index %= int(round(360 / step))
+        # 0.1 * 3 = 0.30000000000000004 와 같은 이진 반올림 잔여를 정리
+        return index, round(index * step, 12)
+
+    def _calculator_key(self):
+        """결과에 영향을 주는 계산기 설정 (설정을 바꾸면 다른 키가 됨)
+
+        항력 공식은 객체 id 가 아니라 종류와 매개변수(formulation_signature)로 구별하므로
+        공식의 매개변수를 수정하거나 다른 객체로 바꿔도 이전 결과를 돌려주지 않습니다.
+        서명은 공식 객체에 저장되어 격자 배열을 조회마다 해시하지 않습니다 (배열 원소를
+        제자리에서 바꾸는 대신 새 배열을 대입하거나 cache_clear 를 호출).
+        """
+        return tuple(self.calculator.settings().values())
+
+    def calculate_ekman_transport(self, wind_speed, wind_direction, latitude, depth,
+                                  levels=None, level_mode='linear', cutoff_tol=None):
+        """EkmanTransportCalculator.calculate_ekman_transport 의 캐시된 결과
+
+        입력은 양자화 간격으로 반올림한 값으로 계산되며, 결과는 변경할 수 없는
+        FrozenEkmanTransportResult 입니다.
+        """
+        key = []
+        values = []
+        for name, value in (('wind_speed', wind_speed), ('wind_direction', wind_direction),
+                            ('latitude', latitude), ('depth', depth)):
+            index, quantized = self.quantize(name, value)
+            key.append(index)
+            values.append(quantized)
+        if levels is not None and np.ndim(levels) > 0:
+            levels_key = np.asarray(levels, dtype=float).tobytes()
+        else:
+            levels_key = levels
+        key = (*key, levels_key, level_mode, cutoff_tol, self._calculator_key())
+
+        result = self.cache.get(key)
+        if result is None:
+            result = FrozenEkmanTransportResult.freeze(
+                self.calculator.calculate_ekman_transport(*values, levels, level_mode, cutoff_tol))
+            self.cache.put(key, result)
+        return result
+
+    def cache_info(self):
+        """캐시 통계 (hits, misses, evictions, currsize, maxsize, currbytes, maxbytes, hit_rate)"""
+        return self.cache.info()
+
+    def cache_clear(self):
+        """캐시된 결과와 통계 초기화"""
+        self.cache.clear()
@@ -0,0 +1,167 @@
+"""
+NetCDF3 바람 자료 입력 모듈 (scipy.io.netcdf_file, 메모리 매핑)
+
+파일을 mmap=True 로 열어 u/v/위도/경도/시간 변수를 필요할 때만 읽고,
+(time, lat, lon) 바람 성분을 시간 청크 단위로 EkmanGridEngine 에 넘깁니다.
+수 GB 파일도 전체를 읽지 않고 첫 청크부터 바로 계산을 시작합니다.
+압축 저장(scale_factor/add_offset)과 결측값(_FillValue/missing_value)은 청크마다 풀어
+NaN 으로 처리합니다.
+"""
+
+import numpy as np
+from scipy.io import netcdf_file
+from ekman_grid import EkmanGridEngine
+from ekman_tiled import DEFAULT_TILE_BYTES, resolve_time_chunk
+
+# 자동 탐색할 변수 이름 (앞의 이름 우선)
+U_NAMES = ('u10', 'U10M', 'u10m', 'uwnd', 'eastward_wind', 'u')
+V_NAMES = ('v10', 'V10M', 'v10m', 'vwnd', 'northward_wind', 'v')
+LATITUDE_NAMES = ('latitude', 'lat', 'nav_lat', 'y')
+LONGITUDE_NAMES = ('longitude', 'lon', 'nav_lon', 'x')
+TIME_NAMES = ('time', 'valid_time', 't')
+
+
+def _attribute(variable, name):
+    """변수 속성 값 (없으면 None, 길이 1 배열은 스칼라로)"""
+    value = getattr(variable, name, None)
+    if value is None:
+        return None
+    value = np.asarray(value)
+    return value.item() if value.size == 1 else value
+
+
+class NetCDFVariable:
+    """메모리 매핑된 NetCDF 변수의 지연 접근 래퍼
+
+    슬라이스한 부분만 디스크에서 읽어 압축 해제/결측값 처리 후 새 배열로 반환합니다.
+    반환 배열은 파일과 메모리를 공유하지 않으므로 파일을 닫은 뒤에도 사용할 수 있습니다.
+    """
+
+    def __init__(self, variable, dtype=np.float64):
+        self._variable = variable
+        self.dtype = np.dtype(dtype)
+        self.dimensions = tuple(variable.dimensions)
+        self.shape = tuple(variable.shape)
+        self.ndim = len(self.shape)
+        self.scale_factor = _attribute(variable, 'scale_factor')
+        self.add_offset = _attribute(variable, 'add_offset')
+        self.fill_values = [value for value in (_attribute(variable, '_FillValue'),
+                                                _attribute(variable, 'missing_value')) if value is not None]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        raw = self._variable.data[index]
+        data = np.array(raw, dtype=self.dtype)
+        if self.fill_values:
+            missing = np.isin(raw, self.fill_values)
+        if self.scale_factor is not None:
+            data *= self.scale_factor
+        if self.add_offset is not None:
+            data += self.add_offset
+        if self.fill_values:
+            data[missing] = np.nan
+        return data
+
+
+class NetCDFWindReader:
+    """NetCDF3 바람 파일 리더
+
+    Args:
+        path: NetCDF3 (classic/64-bit offset) 파일 경로
+        u, v, latitude, longitude, time: 변수 이름 (None이면 *_NAMES 에서 자동 탐색,
+            time 은 없어도 됨)
+        dtype: u/v 를 읽을 정밀도 (EkmanGridEngine 의 calculator.dtype 과 맞추면 추가 변환 없음)
+
+    with 문으로 사용하면 끝날 때 파일을 닫습니다.
+    """
+
+    def __init__(self, path, u=None, v=None, latitude=None, longitude=None, time=None, dtype=np.float64):
+        self.path = path
+        self._file = netcdf_file(path, 'r', mmap=True)
+        variables = self._file.variables
+        self.names = {
+            'u': self._find(u, U_NAMES),
+            'v': self._find(v, V_NAMES),
+            'latitude': self._find(latitude, LATITUDE_NAMES),
+            'longitude': self._find(longitude, LONGITUDE_NAMES),
+            'time': self._find(time, TIME_NAMES, required=False),
+        }
+        self.u = NetCDFVariable(variables[self.names['u']], dtype)
+        self.v = NetCDFVariable(variables[self.names['v']], dtype)
+        if self.u.dimensions != self.v.dimensions:
+            raise ValueError(f"u와 v의 차원이 다릅니다: {self.u.dimensions} != {self.v.dimensions}")
+        if self.u.ndim not in (2, 3):
+            raise ValueError(f"u, v는 (lat, lon) 또는 (time, lat, lon) 변수여야 합니다: {self.u.dimensions}")
+
+        # 좌표 변수는 작으므로 한 번 읽어 둠 (복사본이라 파일과 메모리를 공유하지 않음)
+        self.latitude = NetCDFVariable(variables[self.names['latitude']])[...]
+        self.longitude = NetCDFVariable(variables[self.names['longitude']])[...]
+        if self.latitude.shape != (self.u.shape[-2],) or self.longitude.shape != (self.u.shape[-1],):
+            raise ValueError(f"위도/경도 길이가 바람 격자 {self.u.shape}와 맞지 않습니다")
+        self.time = None
+        self.time_units = None
+        if self.names['time'] is not None and self.u.ndim == 3:
+            time_variable = variables[self.names['time']]
+            self.time = NetCDFVariable(time_variable)[...]
+            units = _attribute(time_variable, 'units')
+            self.time_units = units.decode() if isinstance(units, bytes) else units
+
+    def _find(self, name, candidates, required=True):
+        variables = self._file.variables
+        if name is not None:
+            if name not in variables:
+                raise ValueError(f"변수 '{name}'이(가) 파일에 없습니다 (가능: {sorted(variables)})")
+            return name
+        for candidate in candidates:
+            if candidate in variables:
+                return candidate
+        if required:
+            raise ValueError(f"변수를 찾을 수 없습니다 (시도한 이름: {candidates}, 파일 변수: {sorted(variables)})")
+        return None
+
+    @property
+    def shape(self):
+        return self.u.shape
+
+    def resolve_time_chunk(self, time_chunk=None, chunk_bytes=DEFAULT_TILE_BYTES):
+        """시간 청크 길이 (ekman_tiled.resolve_time_chunk 참고, 2차원 변수는 1)"""
+        if self.u.ndim == 2:
+            return 1
+        ny, nx = self.shape[-2:]
+        return resolve_time_chunk(ny * nx, self.u.dtype.itemsize, time_chunk, chunk_bytes)
+
+    def iter_chunks(self, time_chunk=None):
+        """(시간 슬라이스, u, v) 청크를 순서대로 생성
+
+        2차원 (lat, lon) 변수는 전체를 한 청크로 반환합니다 (시간 슬라이스는 None).
+        """
+        if self.u.ndim == 2:
+            yield None, self.u[...], self.v[...]
+            return
+        step = self.resolve_time_chunk(time_chunk)
+        for start in range(0, self.shape[0], step):
+            window = slice(start, min(start + step, self.shape[0]))
+            yield window, self.u[window], self.v[window]
+
+    def iter_ekman(self, engine=None, time_chunk=None):
+        """시간 청크마다 EkmanGridEngine.compute 결과를 (시간 슬라이스, 결과 딕셔너리) 로 생성"""
+        engine = engine if engine is not None else EkmanGridEngine()
+        for window, u, v in self.iter_chunks(time_chunk):
+            if window is None:
+                yield window, engine.compute(u, v, self.latitude)
+            else:
+                yield window, engine.compute(u, v, self.latitude, index=window, shape=self.shape)
+
+    def close(self):
+        # 메모리 매핑 버퍼를 참조하는 변수를 먼저 놓아야 파일이 경고 없이 닫힘
+        self.u._variable = None
+        self.v._variable = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,221 @@
+"""
+프로세스 풀 기반 병렬 격자 에크만 수송 계산 모듈
+
+입력과 출력 배열은 multiprocessing.shared_memory 로 공유하고, 작업자에게는
+공유 메모리 이름과 슬라이스 범위만 전달하므로 배열 자체는 pickle 되지 않습니다.
+계산기는 풀 초기화 때 작업자마다 한 번만 보내며(나선 캐시 제외), 격자 항력 공식은
+블록별로 잘라 낸 부분만 작업과 함께 보냅니다.
+"""
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from ekman_cache import LRUCache
+from ekman_calculations import EkmanTransportCalculator
+from ekman_grid import EkmanGridEngine
+from ekman_tiled import GRID_FIELDS
+
+
+def _attach_shared(spec):
+    """(이름, shape, dtype) 명세로 기존 공유 메모리 블록에 연결"""
+    name, shape, dtype = spec
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: 작업자는 부모와 같은 resource tracker를 공유하므로 중복 등록은 무해함
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+# 풀 초기화(_init_worker) 때 한 번만 받은 작업자 프로세스의 계산기
+_WORKER_CALCULATOR = None
+
+
+def _init_worker(calculator):
+    """작업자 초기화: 계산기를 작업마다 pickle 하지 않도록 프로세스 전역에 보관"""
+    global _WORKER_CALCULATOR
+    _WORKER_CALCULATOR = calculator
+
+
+def _block_index(ndim, axis, start, stop):
+    """axis 축의 [start:stop] 블록을 고르는 인덱스 튜플"""
+    index = [slice(None)] * ndim
+    index[axis] = slice(start, stop)
+    return tuple(index)
+
+
+def _compute_block(input_specs, output_specs, latitude, axis, start, stop, drag_formulation=None, calculator=None):
+    """작업자: 공유 메모리의 [start:stop] 블록(위도 띠 또는 시간 청크)을 계산
+
+    calculator 가 None 이면 풀 초기화 때 받은 계산기를 쓰고, drag_formulation 이 있으면
+    (이 블록으로 잘라 낸 격자 항력 공식) 그 공식으로 바꿔 계산합니다.
+    """
+    calc = calculator if calculator is not None else _WORKER_CALCULATOR
+    if drag_formulation is not None:
+        calc = copy.copy(calc)
+        calc.drag_formulation = drag_formulation
+    handles = []
+    try:
+        arrays = {}
+        for key, spec in {**input_specs, **output_specs}.items():
+            shm, array = _attach_shared(spec)
+            handles.append(shm)
+            arrays[key] = array
+
+        index = _block_index(arrays['u'].ndim, axis, start, stop)
+        lat = latitude[start:stop] if axis == arrays['u'].ndim - 2 else latitude
+
+        fields = EkmanGridEngine(calc).compute(arrays['u'][index], arrays['v'][index], lat)
+        for field in output_specs:
+            arrays[field][index] = fields[field]
+        del arrays
+    finally:
+        for shm in handles:
+            shm.close()
+    return start, stop
+
+
+class ParallelEkmanExecutor:
+    """위도 띠 또는 시간 청크를 ProcessPoolExecutor 작업자에게 분배하여 계산합니다.
+
+    Args:
+        calculator: EkmanTransportCalculator (작업자에게 전달되는 물리 상수)
+        workers: 작업자 수 (기본값: os.cpu_count())
+        split: 'lat' (위도 띠) 또는 'time' (3차원 입력의 시간 청크)
+        tasks_per_worker: 부하 균형을 위한 작업자당 블록 수
+    """
+
+    def __init__(self, calculator=None, workers=None, split='lat', tasks_per_worker=4):
+        if split not in ('lat', 'time'):
+            raise ValueError(f"split은 'lat' 또는 'time'이어야 합니다: {split}")
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.workers = workers or os.cpu_count() or 1
+        self.split = split
+        self.tasks_per_worker = tasks_per_worker
+
+    def _split_axis(self, ndim):
+        if self.split == 'time':
+            if ndim != 3:
+                raise ValueError("시간 분할은 (time, lat, lon) 3차원 입력에서만 사용할 수 있습니다")
+            return 0
+        return ndim - 2
+
+    def _has_grid_drag(self):
+        """항력 공식이 격자 자료를 잘라 쓸 수 있는지 (블록별로 subset 해서 보냄)"""
+        return hasattr(self.calculator.drag_formulation, 'subset')
+
+    def make_pool(self, workers=None):
+        """계산기를 작업자마다 한 번만 보내 초기화한 프로세스 풀 (run(pool=...) 으로 재사용)
+
+        작업자에게는 나선 캐시를 비운 계산기 사본을 보내고, 격자 항력 공식은 블록별로
+        보내므로 제외합니다. 풀은 생성 시점의 설정을 가지므로 계산기 설정을 바꾸면 새로
+        만들어야 합니다.
+        """
+        calc = copy.copy(self.calculator)
+        calc.spiral_basis_cache = LRUCache(maxsize=self.calculator.spiral_basis_cache.maxsize)
+        if self._has_grid_drag():
+            calc.drag_formulation = None
+        return ProcessPoolExecutor(max_workers=workers or self.workers, initializer=_init_worker, initargs=(calc,))
+
+    def run(self, u, v, latitude, fields=GRID_FIELDS, pool=None):
+        """u, v 격자에 대해 병렬 계산하여 {field: 배열} 딕셔너리 반환
+
+        pool (make_pool) 을 주면 그 풀을 재사용하고, 아니면 이번 호출용 풀을 만들어 닫습니다.
+        """
+        # 공유 메모리 블록은 계산 정밀도(calculator.dtype)로 할당
+        dtype = self.calculator._asarray(0).dtype
+        u = np.asarray(u, dtype=dtype)
+        v = np.asarray(v, dtype=dtype)
+        latitude = np.asarray(latitude, dtype=float)
+        if u.shape != v.shape or u.ndim < 2 or latitude.shape != (u.shape[-2],):
+            raise ValueError(f"입력 shape이 맞지 않습니다: u {u.shape}, v {v.shape}, latitude {latitude.shape}")
+
+        axis = self._split_axis(u.ndim)
+        blocks = np.array_split(np.arange(u.shape[axis]), min(u.shape[axis], self.workers * self.tasks_per_worker))
+        blocks = [(int(b[0]), int(b[-1]) + 1) for b in blocks if b.size]
+
+        segments = []
+        try:
+            def share(array=None):
+                shm = shared_memory.SharedMemory(create=True, size=max(u.nbytes, 1))
+                segments.append(shm)
+                view = np.ndarray(u.shape, dtype=dtype, buffer=shm.buf)
+                if array is not None:
+                    view[...] = array
+                return (shm.name, u.shape, dtype), view
+
+            input_specs = {'u': share(u)[0], 'v': share(v)[0]}
+            output_views = {}
+            output_specs = {}
+            for field in fields:
+                output_specs[field], output_views[field] = share()
+
+            if self.workers == 1 and pool is None:
+                for start, stop in blocks:
+                    calc = self.calculator.subset(_block_index(u.ndim, axis, start, stop), u.shape)
+                    _compute_block(input_specs, output_specs, latitude, axis, start, stop, calculator=calc)
+            else:
+                grid_drag = self._has_grid_drag()
+                owned = pool is None
+                if owned:
+                    pool = self.make_pool()
+                try:
+                    futures = []
+                    for start, stop in blocks:
+                        drag = None
+                        if grid_drag:
+                            index = _block_index(u.ndim, axis, start, stop)
+                            drag = self.calculator.subset(index, u.shape).drag_formulation
+                        futures.append(pool.submit(_compute_block, input_specs, output_specs,
+                                                   latitude, axis, start, stop, drag))
+                    for future in futures:
+                        future.result()
+                finally:
+                    if owned:
+                        pool.shutdown()
+
+            return {field: view.copy() for field, view in output_views.items()}
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    def benchmark(self, u, v, latitude, worker_counts=None, repeat=3):
+        """작업자 수별 실행 시간과 1 작업자 대비 속도 향상(speedup) 측정
+
+        Returns:
+            list[dict]: {'workers', 'seconds', 'speedup', 'efficiency'}
+        """
+        if worker_counts is None:
+            max_workers = os.cpu_count() or 1
+            worker_counts = sorted({1, *[2 ** k for k in range(1, max_workers.bit_length()) if 2 ** k <= max_workers], max_workers})
+
+        original_workers = self.workers
+        report = []
+        try:
+            for workers in worker_counts:
+                self.workers = workers
+                timings = []
+                # 반복 측정에 같은 풀을 재사용하여 작업자 시작 비용을 제외 (min)
+                pool = self.make_pool() if workers > 1 else None
+                try:
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        self.run(u, v, latitude, pool=pool)
+                        timings.append(time.perf_counter() - start)
+                finally:
+                    if pool is not None:
+                        pool.shutdown()
+                report.append({'workers': workers, 'seconds': min(timings)})
+        finally:
+            self.workers = original_workers
+
+        baseline = next((r['seconds'] for r in report if r['workers'] == 1), report[0]['seconds'] * report[0]['workers'])
+        for r in report:
+            r['speedup'] = baseline / r['seconds']
+            r['efficiency'] = r['speedup'] / r['workers']
+        return report
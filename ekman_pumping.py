@@ -0,0 +1,148 @@
+"""
+에크만 펌핑 (바람 응력 컬) 계산 모듈
+
+구면 좌표계 격자에서 벡터장의 컬(curl)과 발산(divergence)을 벡터화하여 계산하고,
+에크만 펌핑 연직 속도 w_E = curl(τ / ρf) 를 구합니다.
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+EARTH_RADIUS = 6.371e6  # m (지구 평균 반지름)
+
+
+def is_periodic_longitude(longitude):
+    """경도 벡터가 지구를 한 바퀴 감싸는지(주기 경계) 판별"""
+    longitude = np.asarray(longitude, dtype=float)
+    if longitude.size < 3:
+        return False
+    spacing = (longitude[-1] - longitude[0]) / (longitude.size - 1)
+    return abs(longitude[-1] - longitude[0] + spacing - 360.0) < 0.5 * abs(spacing)
+
+
+def _one_sided_fallback(derivative, field, forward, backward):
+    """결측(NaN, 육지) 이웃 때문에 중앙 차분이 NaN인 격자를 한쪽 차분으로 대체
+
+    양쪽 이웃이 모두 결측인 격자와 격자 자체가 결측인 격자는 NaN으로 남습니다.
+    """
+    missing = np.isnan(derivative)
+    if not missing.any():
+        return derivative
+    one_sided = np.where(np.isnan(forward), backward, forward)
+    return np.where(missing & ~np.isnan(field), one_sided, derivative)
+
+
+def _lon_derivative(field, lon_rad, periodic):
+    """경도 방향 중앙 차분 (주기 경계 시 양 끝을 이어서 계산, 결측 이웃 옆은 한쪽 차분)"""
+    if periodic:
+        dlon = (np.roll(lon_rad, -1) - np.roll(lon_rad, 1)) % (2 * np.pi)
+        step_forward = (np.roll(lon_rad, -1) - lon_rad) % (2 * np.pi)
+        step_backward = (lon_rad - np.roll(lon_rad, 1)) % (2 * np.pi)
+        ahead = np.roll(field, -1, axis=-1)
+        behind = np.roll(field, 1, axis=-1)
+        derivative = (ahead - behind) / dlon
+        return _one_sided_fallback(derivative, field, (ahead - field) / step_forward,
+                                   (field - behind) / step_backward)
+    derivative = np.gradient(field, lon_rad, axis=-1)
+    return _one_sided_fallback(derivative, field, *_edge_differences(field, lon_rad, axis=-1))
+
+
+def _lat_derivative(field, lat_rad):
+    """위도 방향 중앙 차분 (경계와 결측 이웃 옆에서는 한쪽 차분)"""
+    derivative = np.gradient(field, lat_rad, axis=-2)
+    return _one_sided_fallback(derivative, field, *_edge_differences(field, lat_rad[:, np.newaxis], axis=-2))
+
+
+def _edge_differences(field, coordinate, axis):
+    """비주기 축의 전진/후진 차분 (축 끝에서는 NaN)"""
+    difference = np.diff(field, axis=axis) / np.diff(coordinate, axis=axis)
+    pad = [(0, 0)] * field.ndim
+    pad[axis] = (0, 1)
+    forward = np.pad(difference, pad, constant_values=np.nan)
+    pad[axis] = (1, 0)
+    backward = np.pad(difference, pad, constant_values=np.nan)
+    return forward, backward
+
+
+def _prepare(Fx, Fy, latitude, longitude, mask, periodic):
+    """입력 검증 및 육지 마스크 적용"""
+    Fx = np.asarray(Fx, dtype=float)
+    Fy = np.asarray(Fy, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+    if Fx.shape != Fy.shape:
+        raise ValueError(f"x, y 성분의 shape이 다릅니다: {Fx.shape} != {Fy.shape}")
+    if Fx.ndim < 2 or Fx.shape[-2:] != (latitude.size, longitude.size):
+        raise ValueError(f"격자 shape {Fx.shape}이 위도/경도 벡터 길이와 맞지 않습니다")
+    if periodic is None:
+        periodic = is_periodic_longitude(longitude)
+    if mask is not None:
+        # 육지 격자는 NaN으로 두고, 인접 해양 격자에서는 육지를 쓰지 않는 한쪽 차분을 사용
+        mask = np.asarray(mask, dtype=bool)
+        Fx = np.where(mask, np.nan, Fx)
+        Fy = np.where(mask, np.nan, Fy)
+    lat_rad = np.radians(latitude)
+    cos_lat = np.cos(lat_rad)[:, np.newaxis]
+    # 극점에서는 metric 항이 발산하므로 NaN 처리
+    cos_lat = np.where(np.abs(cos_lat) < 1e-12, np.nan, cos_lat)
+    return Fx, Fy, lat_rad, np.radians(longitude), cos_lat, mask, periodic
+
+
+def _apply_mask(result, mask):
+    if mask is not None:
+        result = np.where(mask, np.nan, result)
+    return result
+
+
+def spherical_curl(Fx, Fy, latitude, longitude, mask=None, periodic=None):
+    """구면 위 벡터장의 연직 컬 성분
+
+    curl_z F = 1/(R cosφ) · [∂Fy/∂λ - ∂(Fx cosφ)/∂φ]
+
+    Args:
+        Fx, Fy: 동서/남북 성분, shape (..., ny, nx)
+        latitude, longitude: 위도/경도 벡터 (도)
+        mask: 육지 마스크 (True = 육지), shape (ny, nx) 또는 입력과 같은 shape.
+            육지 격자의 결과는 NaN이고, 육지에 인접한 해양 격자는 한쪽 차분으로 계산
+        periodic: 경도 주기 경계 사용 여부 (None이면 경도 벡터로 자동 판별)
+    """
+    Fx, Fy, lat_rad, lon_rad, cos_lat, mask, periodic = _prepare(Fx, Fy, latitude, longitude, mask, periodic)
+    dFy_dlon = _lon_derivative(Fy, lon_rad, periodic)
+    dFxcos_dlat = _lat_derivative(Fx * cos_lat, lat_rad)
+    curl = (dFy_dlon - dFxcos_dlat) / (EARTH_RADIUS * cos_lat)
+    return _apply_mask(curl, mask)
+
+
+def spherical_divergence(Fx, Fy, latitude, longitude, mask=None, periodic=None):
+    """구면 위 벡터장의 수평 발산
+
+    div F = 1/(R cosφ) · [∂Fx/∂λ + ∂(Fy cosφ)/∂φ]
+
+    인자는 spherical_curl 과 같습니다.
+    """
+    Fx, Fy, lat_rad, lon_rad, cos_lat, mask, periodic = _prepare(Fx, Fy, latitude, longitude, mask, periodic)
+    dFx_dlon = _lon_derivative(Fx, lon_rad, periodic)
+    dFycos_dlat = _lat_derivative(Fy * cos_lat, lat_rad)
+    divergence = (dFx_dlon + dFycos_dlat) / (EARTH_RADIUS * cos_lat)
+    return _apply_mask(divergence, mask)
+
+
+def ekman_pumping_velocity(tau_x, tau_y, latitude, longitude, calculator=None, mask=None, periodic=None):
+    """에크만 펌핑 연직 속도 w_E = curl(τ / ρf) (m/s, 양수 = 용승)
+
+    바람 응력 장(예: EkmanGridEngine.compute 결과의 'tau_x', 'tau_y')을 받아
+    계산기의 해수 밀도(rho_water)와 코리올리 매개변수를 사용합니다.
+    적도 부근에서는 f → 0 이므로 값이 매우 커집니다. calculator.equatorial_mode 가
+    설정되면 w_E 는 정규화된 수송량 M = τ(r + i f)/(ρ(r² + f²)) (격자 엔진의 Mx, My)의
+    발산 -div M 으로 계산됩니다 (r = 0 이면 curl(τ/ρf) = -div M 과 같음).
+    """
+    calculator = calculator if calculator is not None else EkmanTransportCalculator()
+    f, r = calculator.coriolis_and_friction(latitude)
+    tau_x = np.asarray(tau_x, dtype=float)
+    tau_y = np.asarray(tau_y, dtype=float)
+    if r is not None:
+        # 마찰 항(r·τ)은 컬이 아니라 발산에 기여하므로 정규화된 수송량의 발산으로 계산
+        Mx, My, _ = calculator._transport_from_stress(tau_x, tau_y, f[:, np.newaxis], r[:, np.newaxis])
+        return -spherical_divergence(Mx, My, latitude, longitude, mask=mask, periodic=periodic)
+    inverse_rho_f = (1 / f / calculator.rho_water)[:, np.newaxis]
+    return spherical_curl(tau_x * inverse_rho_f, tau_y * inverse_rho_f, latitude, longitude, mask=mask, periodic=periodic)
@@ -0,0 +1,190 @@
+"""
+에크만 수송 계산 결과 객체
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
+
+# 결과 항목 (기존 결과 딕셔너리와 같은 순서)
+RESULT_KEYS = (
+    'wind_speed', 'wind_direction', 'latitude', 'depth', 'wind_stress',
+    'tau_x', 'tau_y', 'Mx', 'My', 'ekman_depth', 'z_levels', 'ekman_spiral',
+    'f', 'energy_transfer_rate'
+)
+# 처음 접근할 때 계산되는 항목
+LAZY_KEYS = ('z_levels', 'ekman_spiral', 'energy_transfer_rate')
+# 구조화 배열(record)로 저장되는 스칼라 항목
+RECORD_FIELDS = tuple(key for key in RESULT_KEYS if key not in ('z_levels', 'ekman_spiral'))
+RECORD_DTYPE = np.dtype([(key, np.float64) for key in RECORD_FIELDS])
+
+
+class EkmanTransportResult(Mapping):
+    """에크만 수송 계산 결과 (__slots__ 기반 경량 객체)
+
+    수송량(Mx, My), 바람 응력, 에크만 깊이 등은 즉시 계산되어 저장되고,
+    'z_levels', 'ekman_spiral', 'energy_transfer_rate' 는 처음 접근할 때 계산됩니다.
+    지연 항목은 결과 생성 시점의 계산기 설정(physics: rho_water, K, dtype)으로 계산되므로
+    그 뒤에 계산기 설정을 바꿔도 결과는 달라지지 않습니다.
+
+    results.Mx 와 같은 속성 접근 외에, 기존 결과 딕셔너리와 같이 results['Mx'],
+    results.get(...), dict(results) 로 사용할 수 있습니다.
+    """
+
+    __slots__ = (
+        'wind_speed', 'wind_direction', 'latitude', 'depth', 'wind_stress',
+        'tau_x', 'tau_y', 'Mx', 'My', 'ekman_depth', 'f',
+        '_calculator', '_rho_water', '_K', '_dtype', '_r', '_level_options',
+        '_z_levels', '_ekman_spiral', '_energy_transfer_rate'
+    )
+
+    def __init__(self, calculator, physics, level_options, wind_speed, wind_direction, latitude, depth,
+                 wind_stress, tau_x, tau_y, Mx, My, ekman_depth, f, r=None,
+                 z_levels=None, ekman_spiral=None, energy_transfer_rate=None):
+        self._calculator = calculator
+        self._rho_water, self._K, self._dtype = physics
+        self._level_options = level_options
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        self.latitude = latitude
+        self.depth = depth
+        self.wind_stress = wind_stress
+        self.tau_x = tau_x
+        self.tau_y = tau_y
+        self.Mx = Mx
+        self.My = My
+        self.ekman_depth = ekman_depth
+        self.f = f
+        # 적도 마찰 (equatorial_mode, None이면 사용하지 않음)
+        self._r = r
+        # 지연 항목은 이미 계산된 값을 넘기면 그대로 사용 (SimilarityEvaluator)
+        self._z_levels = z_levels
+        self._ekman_spiral = ekman_spiral
+        self._energy_transfer_rate = energy_transfer_rate
+
+    @property
+    def z_levels(self):
+        """에크만 나선 연직 격자 (m)"""
+        if self._z_levels is None:
+            self._z_levels = self._calculator.make_z_levels(self.depth, self.ekman_depth, *self._level_options,
+                                                            dtype=self._dtype)
+        return self._z_levels
+
+    @property
+    def ekman_spiral(self):
+        """에크만 나선 속도 성분 {'u', 'v'} (m/s)"""
+        if self._ekman_spiral is None:
+            self._ekman_spiral = self._calculator.calculate_ekman_spiral(
+                self.z_levels, self.tau_x, self.tau_y, self.f, self._K, self._rho_water, self._dtype, self._r)
+        return self._ekman_spiral
+
+    @property
+    def energy_transfer_rate(self):
+        """표층 해류(z=0) 기반 에너지 전달률 (W/m^2)"""
+        if self._energy_transfer_rate is None:
+            self._energy_transfer_rate = self._calculator._surface_energy_transfer(
+                self.tau_x, self.tau_y, self.f, self._r, self._K, self._rho_water)
+        return self._energy_transfer_rate
+
+    def __getitem__(self, key):
+        if key not in RESULT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(RESULT_KEYS)
+
+    def __len__(self):
+        return len(RESULT_KEYS)
+
+    def is_computed(self, key):
+        """해당 항목이 이미 계산되었는지 여부"""
+        if key in LAZY_KEYS:
+            return getattr(self, '_' + key) is not None
+        return key in RESULT_KEYS
+
+    def to_dict(self):
+        """모든 항목을 계산한 일반 딕셔너리 (기존 결과 딕셔너리 형식)"""
+        return {key: getattr(self, key) for key in RESULT_KEYS}
+
+    def copy(self):
+        """to_dict() 와 같음 (기존 dict.copy() 호환)"""
+        return self.to_dict()
+
+    def to_numpy(self):
+        """스칼라 항목의 구조화 배열(0차원, RECORD_DTYPE) 표현"""
+        return np.array(tuple(getattr(self, key) for key in RECORD_FIELDS), dtype=RECORD_DTYPE)
+
+    def __repr__(self):
+        shown = ', '.join(f"{key}={getattr(self, key)!r}" for key in RECORD_FIELDS if key not in LAZY_KEYS)
+        return f"{type(self).__name__}({shown})"
+
+
+class FrozenEkmanTransportResult(EkmanTransportResult):
+    """변경할 수 없는 EkmanTransportResult (캐시에 저장해 여러 호출자가 공유하는 결과)
+
+    모든 지연 항목이 계산된 상태로 만들어지며, 속성 대입은 AttributeError,
+    배열은 읽기 전용, 'ekman_spiral' 은 읽기 전용 매핑입니다.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def freeze(cls, result):
+        """EkmanTransportResult 의 모든 항목을 계산하여 변경할 수 없는 복사본 생성"""
+        frozen = cls.__new__(cls)
+        spiral = result.ekman_spiral
+        values = {name: getattr(result, name) for name in EkmanTransportResult.__slots__}
+        values['_energy_transfer_rate'] = result.energy_transfer_rate
+        values['_z_levels'] = _readonly(result.z_levels)
+        values['_ekman_spiral'] = MappingProxyType({key: _readonly(value) for key, value in spiral.items()})
+        for name, value in values.items():
+            object.__setattr__(frozen, name, value)
+        return frozen
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}는 변경할 수 없습니다: '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__}는 변경할 수 없습니다: '{name}'")
+
+    def to_dict(self):
+        """모든 항목의 일반 딕셔너리 (배열은 읽기 전용, 'ekman_spiral' 은 일반 딕셔너리)"""
+        results = super().to_dict()
+        results['ekman_spiral'] = dict(self._ekman_spiral)
+        return results
+
+
+def _readonly(value):
+    """값의 읽기 전용 배열 사본 (스칼라는 그대로)"""
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.setflags(write=False)
+    return value
+
+
+def to_records(results):
+    """여러 결과를 하나의 연속된 구조화 배열로 변환
+
+    Args:
+        results: EkmanTransportResult 의 시퀀스, 또는
+            calculate_ekman_transport_batch 가 반환하는 배열 딕셔너리
+
+    Returns:
+        np.ndarray: RECORD_FIELDS 중 해당 항목을 필드로 갖는 구조화 배열
+            (np.recarray 가 필요하면 .view(np.recarray))
+    """
+    if isinstance(results, Mapping) and not isinstance(results, EkmanTransportResult):
+        fields = [key for key in RECORD_FIELDS if key in results]
+        arrays = np.broadcast_arrays(*(np.asarray(results[key]) for key in fields))
+        records = np.empty(arrays[0].shape if arrays else (0,),
+                           dtype=[(key, array.dtype) for key, array in zip(fields, arrays)])
+        for key, array in zip(fields, arrays):
+            records[key] = array
+        return records
+
+    records = np.empty(len(results), dtype=RECORD_DTYPE)
+    for i, result in enumerate(results):
+        records[i] = result.to_numpy()
+    return records
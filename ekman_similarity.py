@@ -0,0 +1,94 @@
+"""
+상사(similarity) 기반 빠른 에크만 수송 계산
+
+에크만 수송과 에크만 나선은 바람 응력 τ 에 대해 선형이므로, 같은 위도와 깊이 격자에서
+임의의 바람 속도/방향에 대한 해는 단위 응력 τ = (1, 0) N/m² 해를 |τ| 배 하고
+바람 방향 θ 만큼 회전한 것과 같습니다 (복소수로 M = (τx + iτy)·M₁).
+(위도, 깊이 격자)마다 단위 해를 한 번만 계산해 캐시하고, 바람 속도/방향 질의는
+응력 계산과 2×2 회전만으로 답합니다. |τ| 는 계산기의 항력 계수(항력 공식 포함)로 구하므로
+상수 Cd 뿐 아니라 바람 속도 의존 항력 공식에서도 성립합니다.
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+from ekman_cache import LRUCache
+from ekman_result import EkmanTransportResult
+
+DEFAULT_UNIT_CACHE_SIZE = 256
+
+
+class SimilarityEvaluator:
+    """단위 응력 해를 캐시하여 calculate_ekman_transport 와 같은 결과를 빠르게 계산
+
+    Args:
+        calculator: EkmanTransportCalculator (해수 밀도, K, 항력 계수, 정밀도 설정)
+        cache_size: 캐시할 단위 해 (위도, 깊이 격자) 개수
+    """
+
+    def __init__(self, calculator=None, cache_size=DEFAULT_UNIT_CACHE_SIZE):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.unit_cache = LRUCache(maxsize=cache_size)
+
+    def unit_solution(self, latitude, depth, levels=None, level_mode='linear', cutoff_tol=None):
+        """단위 응력 τ = (1, 0) N/m² 에 대한 해 (읽기 전용 배열 딕셔너리)
+
+        해는 위도, 깊이 격자 설정과 계산기의 rho_water, K, dtype, 적도 처리 설정에만
+        의존하므로 이들을 키로 캐시합니다.
+        """
+        calc = self.calculator
+        if levels is not None and np.ndim(levels) > 0:
+            levels_key = np.asarray(levels, dtype=float).tobytes()
+        else:
+            levels_key = levels
+        key = (float(latitude), float(depth), levels_key, level_mode, cutoff_tol,
+               float(calc.rho_water), float(calc.K), np.dtype(calc.dtype).str,
+               calc.equatorial_mode, float(calc.equatorial_band), calc.equatorial_friction)
+        unit = self.unit_cache.get(key)
+        if unit is not None:
+            return unit
+
+        latitude, f, r = calc._scalar_coriolis(latitude)
+        Mx, My, ekman_depth = calc._transport_from_stress(1.0, 0.0, f, r)
+        z_levels = calc.make_z_levels(depth, ekman_depth, levels, level_mode, cutoff_tol)
+        spiral = calc.calculate_ekman_spiral(z_levels, 1.0, 0.0, f, calc.K, r=r)
+        unit = {
+            'latitude': latitude,
+            'f': f,
+            'r': r,
+            'Mx': Mx,
+            'My': My,
+            'ekman_depth': ekman_depth,
+            'z_levels': z_levels,
+            'u': spiral['u'],
+            'v': spiral['v'],
+            # 에너지 전달률은 |τ|² 에 비례
+            'energy_per_stress_squared': calc._surface_energy_transfer(1.0, 0.0, f, r),
+        }
+        for array in (unit['z_levels'], unit['u'], unit['v']):
+            array.setflags(write=False)
+        self.unit_cache.put(key, unit)
+        return unit
+
+    def evaluate(self, wind_speed, wind_direction, latitude, depth,
+                 levels=None, level_mode='linear', cutoff_tol=None):
+        """calculate_ekman_transport 와 같은 인자와 결과 (EkmanTransportResult)
+
+        에크만 나선과 에너지 전달률도 단위 해의 스케일/회전으로 즉시 채워집니다.
+        결과의 z_levels 는 캐시와 공유하는 읽기 전용 배열입니다.
+        """
+        calc = self.calculator
+        unit = self.unit_solution(latitude, depth, levels, level_mode, cutoff_tol)
+        wind_stress, tau_x, tau_y = calc._wind_stress_components(wind_speed, wind_direction)
+
+        # (τx + iτy)·(단위 해): 크기 |τ| 스케일과 방향 θ 회전
+        Mx = tau_x * unit['Mx'] - tau_y * unit['My']
+        My = tau_x * unit['My'] + tau_y * unit['Mx']
+        u = tau_x * unit['u'] - tau_y * unit['v']
+        v = tau_x * unit['v'] + tau_y * unit['u']
+        energy_transfer_rate = wind_stress * wind_stress * unit['energy_per_stress_squared']
+
+        return EkmanTransportResult(calc, calc._physics(), (levels, level_mode, cutoff_tol),
+                                    wind_speed, wind_direction, unit['latitude'], depth,
+                                    wind_stress, tau_x, tau_y, Mx, My, unit['ekman_depth'], unit['f'], unit['r'],
+                                    z_levels=unit['z_levels'], ekman_spiral={'u': u, 'v': v},
+                                    energy_transfer_rate=energy_transfer_rate)
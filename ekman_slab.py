@@ -0,0 +1,111 @@
+"""
+시간 의존 슬랩(slab) 에크만 모형 적분기
+
+혼합층 전체 수송량 M = Mx + iMy 에 대한 방정식
+
+    dM/dt = τ/ρ + i f M - r M
+
+을 여러 격자점에 대해 벡터화하여 적분합니다. 정상 상태(r = 0)에서
+M = iτ/(ρf) 로 calculate_ekman_transport 의 Mx, My 와 같고, 바람 변화에 대한
+스핀업과 관성 진동(주기 2π/f)을 재현합니다.
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+INTEGRATION_METHODS = ('exponential', 'rk4')
+DEFAULT_DAMPING = 1 / (4 * 86400)  # 1/s (관성 진동 감쇠 시간 규모 4일)
+
+
+class SlabEkmanModel:
+    """바람 응력 시계열로 구동되는 슬랩 에크만 모형
+
+    Args:
+        calculator: 해수 밀도와 코리올리 매개변수를 제공하는 EkmanTransportCalculator
+        damping: 선형 감쇠율 r (1/s)
+        method: 'exponential' — 시간 간격 동안 응력이 일정하다고 보는 정확한 지수 적분기
+            (시간 간격에 제약 없이 안정), 'rk4' — 고전적 4차 Runge-Kutta (|f|·dt 가
+            작아야 정확/안정)
+    """
+
+    def __init__(self, calculator=None, damping=DEFAULT_DAMPING, method='exponential'):
+        if method not in INTEGRATION_METHODS:
+            raise ValueError(f"지원하지 않는 적분 방법입니다: {method} (가능: {INTEGRATION_METHODS})")
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.damping = damping
+        self.method = method
+
+    def decay_rate(self, latitude):
+        """복소 감쇠율 λ = r - i f (dM/dt = τ/ρ - λM)
+
+        calculator.equatorial_mode 가 설정되면 적도 마찰이 감쇠율 r 에 더해집니다.
+        """
+        f, r_equatorial = self.calculator.coriolis_and_friction(latitude)
+        damping = self.damping if r_equatorial is None else self.damping + r_equatorial
+        return damping - 1j * f
+
+    def _exponential_coefficients(self, lam, dt):
+        """정확한 지수 적분 계수: M(n+1) = E·M(n) + Φ·τ(n)/ρ"""
+        E = np.exp(-lam * dt)
+        small = np.abs(lam * dt) < 1e-8
+        # |λ·dt| → 0 극한에서 (1 - e^{-λdt})/λ → dt
+        phi = np.where(small, dt, (1 - E) / np.where(small, 1.0, lam))
+        return E, phi / self.calculator.rho_water
+
+    def integrate(self, tau_x, tau_y, latitude, dt, M0=None, output_every=1, out=None):
+        """바람 응력 시계열에 대한 적분
+
+        Args:
+            tau_x, tau_y: 바람 응력 (N/m²), shape (nt, npoints) — np.memmap 가능
+            latitude: 위도 (도), shape (npoints,)
+            dt: 시간 간격 (s)
+            M0: 초기 복소 수송량 (m²/s), shape (npoints,) (기본값 0)
+            output_every: 출력 간격 (단계 수)
+            out: 출력 {'Mx', 'My'} 배열 딕셔너리, shape (nt // output_every, npoints)
+                (np.memmap 가능, 기본값은 새로 할당)
+
+        Returns:
+            dict: 'Mx', 'My' — 각 출력 시각(n·output_every 단계 후)의 수송량,
+            'state' — 마지막 단계 후의 복소 수송량 (이어서 적분할 때 M0로 사용)
+        """
+        nt = tau_x.shape[0]
+        if tau_y.shape != tau_x.shape:
+            raise ValueError(f"tau_x와 tau_y의 shape이 다릅니다: {tau_x.shape} != {tau_y.shape}")
+        lam = self.decay_rate(np.asarray(latitude, dtype=float))
+        shape = np.broadcast_shapes(lam.shape, tau_x.shape[1:])
+
+        M = np.zeros(shape, dtype=complex)
+        if M0 is not None:
+            M[...] = M0
+        n_out = nt // output_every
+        if out is None:
+            out = {'Mx': np.empty((n_out,) + shape), 'My': np.empty((n_out,) + shape)}
+
+        buffer = np.empty(shape, dtype=complex)
+        if self.method == 'exponential':
+            E, phi = self._exponential_coefficients(lam, dt)
+            i_phi = 1j * phi
+            for n in range(nt):
+                # M ← E·M + Φ·(τx + iτy)/ρ (임시 배열 없이 제자리 연산)
+                M *= E
+                M += np.multiply(phi, tau_x[n], out=buffer)
+                M += np.multiply(i_phi, tau_y[n], out=buffer)
+                if (n + 1) % output_every == 0:
+                    k = (n + 1) // output_every - 1
+                    out['Mx'][k] = M.real
+                    out['My'][k] = M.imag
+        else:
+            rho = self.calculator.rho_water
+            for n in range(nt):
+                forcing = (tau_x[n] + 1j * tau_y[n]) / rho
+                k1 = forcing - lam * M
+                k2 = forcing - lam * (M + 0.5 * dt * k1)
+                k3 = forcing - lam * (M + 0.5 * dt * k2)
+                k4 = forcing - lam * (M + dt * k3)
+                M += dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+                if (n + 1) % output_every == 0:
+                    k = (n + 1) // output_every - 1
+                    out['Mx'][k] = M.real
+                    out['My'][k] = M.imag
+
+        return {'Mx': out['Mx'], 'My': out['My'], 'state': M}
@@ -0,0 +1,134 @@
+"""
+연직 난류 점성 계수 K(z)가 깊이에 따라 변하는 정상 에크만 문제의 수치 해법
+
+복소 속도 W = u + iv 에 대한 운동량 방정식 (ζ: 깊이, 아래 방향 양수)
+
+    -i f W = d/dζ (K dW/dζ),    K dW/dζ|ζ=0 = -τ/ρ
+
+을 유한체적법으로 이산화하고 (calculator.equatorial_mode 가 있으면 적도 마찰 r 을 더한
+(r - i f) W = d/dζ (K dW/dζ)), 여러 연직 기둥(column)을 일괄 삼중대각
+(Thomas) 해법으로 동시에 풉니다. 부호 규약은 패키지의 수송식
+Mx = -τy/(ρf), My = τx/(ρf) (즉 M = iτ/(ρf))과 같습니다.
+
+K가 일정하면 해는 W = (1 + i·sgn f)·(calculate_ekman_spiral 의 u + iv) 이며,
+calculate_ekman_spiral 은 표층 응력 경계조건의 위상/크기 계수 (1 + i·sgn f)를
+생략한 표시용 나선입니다.
+"""
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+BOTTOM_CONDITIONS = ('free_slip', 'no_slip')
+
+
+def solve_tridiagonal_batch(lower, diag, upper, rhs):
+    """여러 삼중대각 연립방정식을 Thomas 알고리즘으로 동시에 풀기
+
+    lower[..., j]·x[..., j-1] + diag[..., j]·x[..., j] + upper[..., j]·x[..., j+1] = rhs[..., j]
+
+    모든 인자는 마지막 축이 방정식 번호인 (브로드캐스트 가능한) 배열이며
+    lower[..., 0], upper[..., -1] 은 사용되지 않습니다. 반복은 연직 격자 수만큼만
+    돌고, 기둥 방향으로는 완전히 벡터화되어 있습니다.
+    """
+    lower, diag, upper, rhs = np.broadcast_arrays(lower, diag, upper, rhs)
+    dtype = np.result_type(lower, diag, upper, rhs)
+    n = diag.shape[-1]
+    c_prime = np.empty(diag.shape, dtype=dtype)
+    d_prime = np.empty(diag.shape, dtype=dtype)
+
+    c_prime[..., 0] = upper[..., 0] / diag[..., 0]
+    d_prime[..., 0] = rhs[..., 0] / diag[..., 0]
+    for j in range(1, n):
+        denom = diag[..., j] - lower[..., j] * c_prime[..., j - 1]
+        c_prime[..., j] = upper[..., j] / denom
+        d_prime[..., j] = (rhs[..., j] - lower[..., j] * d_prime[..., j - 1]) / denom
+
+    x = d_prime
+    for j in range(n - 2, -1, -1):
+        x[..., j] -= c_prime[..., j] * x[..., j + 1]
+    return x
+
+
+class EkmanColumnSolver:
+    """깊이에 따라 변하는 K(z)에 대한 정상 에크만 나선 일괄 수치 해법"""
+
+    def __init__(self, calculator=None):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+
+    def interface_viscosity(self, K, z_levels, n_columns):
+        """격자 경계면(인접 격자 중점)에서의 K, shape (n_columns 또는 1, nz-1)
+
+        K는 스칼라, 격자점 값 배열 (nz,) 또는 (n_columns, nz), 또는 깊이를 받아
+        K를 반환하는 함수일 수 있습니다.
+        """
+        midpoints = 0.5 * (z_levels[1:] + z_levels[:-1])
+        if K is None:
+            K = self.calculator.K
+        if callable(K):
+            K_faces = np.asarray(K(midpoints), dtype=float)
+        else:
+            K = np.asarray(K, dtype=float)
+            K_faces = K if K.ndim == 0 else 0.5 * (K[..., 1:] + K[..., :-1])
+        K_faces = np.broadcast_to(K_faces, np.broadcast_shapes(np.shape(K_faces), (1, midpoints.size)))
+        if K_faces.shape[0] not in (1, n_columns):
+            raise ValueError(f"K의 기둥 수 {K_faces.shape[0]}가 입력 기둥 수 {n_columns}와 맞지 않습니다")
+        if np.any(K_faces <= 0):
+            raise ValueError("K는 양수여야 합니다")
+        return K_faces
+
+    def solve(self, tau_x, tau_y, latitude, z_levels, K=None, bottom='free_slip'):
+        """여러 기둥의 에크만 나선을 동시에 계산
+
+        Args:
+            tau_x, tau_y: 바람 응력 (N/m²), shape (n_columns,) 또는 스칼라
+            latitude: 위도 (도), tau 와 브로드캐스트 가능
+            z_levels: 깊이 격자 (m), 0에서 시작하는 오름차순 1차원 배열
+            K: 난류 점성 계수 (m²/s) — interface_viscosity 참고 (기본값: calculator.K)
+            bottom: 'free_slip' (바닥 응력 0, 이산 수송량이 일괄 계산의 τ(r + i f)/(ρ(r² + f²))
+                (r = 0 이면 iτ/(ρf))와 정확히 일치)
+                또는 'no_slip' (바닥 속도 0)
+
+        Returns:
+            dict: 'u', 'v' (n_columns, nz), 'Mx', 'My' (n_columns,), 'z_levels'
+        """
+        if bottom not in BOTTOM_CONDITIONS:
+            raise ValueError(f"지원하지 않는 바닥 경계조건입니다: {bottom} (가능: {BOTTOM_CONDITIONS})")
+        z_levels = np.asarray(z_levels, dtype=float)
+        if z_levels.ndim != 1 or z_levels.size < 3 or z_levels[0] != 0 or np.any(np.diff(z_levels) <= 0):
+            raise ValueError("z_levels는 0에서 시작하는 오름차순 1차원 배열(3개 이상)이어야 합니다")
+
+        tau_x, tau_y, latitude = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (tau_x, tau_y, latitude)))
+        n_columns = tau_x.shape[0]
+        f, r = self.calculator.coriolis_and_friction(latitude)
+        f = f[:, np.newaxis]
+        # 적도 마찰 (equatorial_mode 가 None이면 0)
+        r = 0.0 if r is None else r[:, np.newaxis]
+        rho = self.calculator.rho_water
+
+        # 유한체적 계수: 경계면 전도도 K/h, 격자점 제어체적 두께 Δ
+        h = np.diff(z_levels)
+        conductance = self.interface_viscosity(K, z_levels, n_columns) / h
+        width = np.empty_like(z_levels)
+        width[0] = 0.5 * h[0]
+        width[-1] = 0.5 * h[-1]
+        width[1:-1] = 0.5 * (h[1:] + h[:-1])
+
+        nz = z_levels.size
+        zeros = np.zeros((conductance.shape[0], 1))
+        lower = np.concatenate([zeros, conductance], axis=-1)
+        upper = np.concatenate([conductance, zeros], axis=-1)
+        diag = -(lower + upper) + (1j * f - r) * width
+        rhs = np.zeros((n_columns, nz), dtype=complex)
+        # 표층 응력 경계조건: K dW/dζ|0 = -τ/ρ
+        rhs[:, 0] = -(tau_x + 1j * tau_y) / rho
+
+        if bottom == 'no_slip':
+            diag = np.array(np.broadcast_to(diag, (n_columns, nz)))
+            lower = np.array(np.broadcast_to(lower, diag.shape))
+            diag[:, -1] = 1.0
+            lower[:, -1] = 0.0
+
+        W = solve_tridiagonal_batch(lower, diag, upper, rhs)
+        M = np.sum(W * width, axis=-1)
+        return {'u': W.real, 'v': W.imag, 'Mx': M.real, 'My': M.imag, 'z_levels': z_levels}
@@ -0,0 +1,58 @@
+"""
+시간 시계열 바람 자료의 스트리밍 에크만 수송 계산 모듈
+
+전체 기록을 메모리에 올리지 않고 청크 단위로 읽어 일괄(batch) 커널로 계산한 뒤
+결과를 순차적으로 내보냅니다. 최대 메모리 사용량은 기록 길이가 아니라
+청크 크기에 비례합니다.
+"""
+
+import itertools
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def iter_array_chunks(wind_speed, wind_direction, chunk_size=DEFAULT_CHUNK_SIZE):
+    """배열(np.memmap 포함)을 첫 번째 축을 따라 청크로 나누어 순회
+
+    np.memmap 입력은 슬라이스한 청크만 실제로 디스크에서 읽힙니다.
+    """
+    if len(wind_speed) != len(wind_direction):
+        raise ValueError("바람 속도와 바람 방향의 길이가 다릅니다")
+    for start in range(0, len(wind_speed), chunk_size):
+        stop = start + chunk_size
+        yield np.asarray(wind_speed[start:stop]), np.asarray(wind_direction[start:stop])
+
+
+def read_wind_csv_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=(0, 1), delimiter=',', skiprows=0):
+    """CSV/텍스트 관측 기록에서 (바람 속도, 바람 방향) 청크를 순차적으로 읽기
+
+    Args:
+        path: 파일 경로
+        chunk_size: 한 번에 읽을 행 수
+        columns: 바람 속도, 바람 방향 열 번호
+        delimiter: 구분자 (None이면 공백)
+        skiprows: 건너뛸 헤더 행 수
+    """
+    with open(path, 'r', encoding='utf-8') as fh:
+        for _ in itertools.islice(fh, skiprows):
+            pass
+        while True:
+            lines = list(itertools.islice(fh, chunk_size))
+            if not lines:
+                break
+            data = np.loadtxt(lines, delimiter=delimiter, usecols=columns, ndmin=2)
+            yield data[:, 0], data[:, 1]
+
+
+def stream_ekman_transport(chunks, latitude, depth=100.0, calculator=None):
+    """(바람 속도, 바람 방향) 청크 이터러블에 대한 에크만 수송 제너레이터
+
+    각 청크는 calculate_ekman_transport_batch 로 계산되며, 청크별 결과 딕셔너리를
+    순서대로 yield 합니다. 위도와 깊이는 스칼라(단일 관측소) 또는 청크와
+    브로드캐스트 가능한 배열이어야 합니다.
+    """
+    calculator = calculator if calculator is not None else EkmanTransportCalculator()
+    for wind_speed, wind_direction in chunks:
+        yield calculator.calculate_ekman_transport_batch(wind_speed, wind_direction, latitude, depth)
@@ -0,0 +1,203 @@
+"""
+바람 속도 × 바람 방향 × 위도 × 깊이 매개변수 스윕 엔진
+
+축마다 값 목록을 받아 전체 결과 큐브를 브로드캐스팅으로 계산하고, 축 이름과 값이
+붙은 결과(SweepResult)나 pandas DataFrame, CSV, NPZ 로 내보냅니다. 계산은 C 순서로
+연속된 청크 단위로 이루어져 커널의 임시 배열이 메모리 예산(max_bytes)을 넘지 않으며,
+to_csv/to_npz 는 전체 큐브를 메모리에 만들지 않고 청크를 바로 파일에 씁니다.
+"""
+
+import math
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+
+SWEEP_AXES = ('wind_speed', 'wind_direction', 'latitude', 'depth')
+SWEEP_FIELDS = ('wind_stress', 'tau_x', 'tau_y', 'Mx', 'My', 'ekman_depth', 'f', 'energy_transfer_rate')
+DEFAULT_SWEEP_BYTES = 64 * 2 ** 20  # 청크당 일괄 계산 결과 메모리 (64 MiB)
+
+
+class SweepResult:
+    """축 이름/값이 붙은 스윕 결과 큐브
+
+    Attributes:
+        axes: {축 이름: 값 배열} (SWEEP_AXES 순서)
+        data: {항목: 배열}, shape 은 축 길이 순서 (wind_speed, wind_direction, latitude, depth)
+    """
+
+    def __init__(self, axes, data):
+        self.axes = axes
+        self.data = data
+
+    @property
+    def shape(self):
+        return tuple(values.size for values in self.axes.values())
+
+    def __getitem__(self, field):
+        return self.data[field]
+
+    def sel(self, **coords):
+        """축 값으로 부분 큐브 선택 (예: sel(latitude=30)). 지정한 축은 제거됩니다."""
+        index = []
+        for name, values in self.axes.items():
+            if name in coords:
+                matches = np.flatnonzero(np.isclose(values, coords[name]))
+                if matches.size == 0:
+                    raise ValueError(f"{name} 축에 값 {coords[name]}이(가) 없습니다")
+                index.append(int(matches[0]))
+            else:
+                index.append(slice(None))
+        index = tuple(index)
+        axes = {name: values for name, values in self.axes.items() if name not in coords}
+        return SweepResult(axes, {field: array[index] for field, array in self.data.items()})
+
+    def to_dataframe(self):
+        """축 값의 MultiIndex 를 가진 pandas DataFrame (행: 큐브의 C 순서)"""
+        import pandas as pd
+
+        index = pd.MultiIndex.from_product(list(self.axes.values()), names=list(self.axes))
+        return pd.DataFrame({field: array.reshape(-1) for field, array in self.data.items()}, index=index)
+
+    def to_csv(self, path):
+        """to_dataframe() 을 CSV 파일로 저장 (EkmanSweep.to_csv 와 같은 열 구성)"""
+        self.to_dataframe().to_csv(path)
+        return path
+
+    def to_npz(self, path):
+        """축 값('axis_<이름>')과 결과 항목을 NPZ 파일로 저장"""
+        np.savez(path, **{f'axis_{name}': values for name, values in self.axes.items()}, **self.data)
+
+
+class EkmanSweep:
+    """데카르트 곱 매개변수 스윕
+
+    Args:
+        wind_speed, wind_direction, latitude, depth: 축별 값 목록 (스칼라는 길이 1 축)
+        calculator: EkmanTransportCalculator (상수, 정밀도, 적도 처리 설정)
+        fields: 계산할 calculate_ekman_transport_batch 결과 항목
+        max_bytes: 청크당 결과 메모리 상한
+    """
+
+    def __init__(self, wind_speed, wind_direction, latitude, depth=100.0, calculator=None,
+                 fields=SWEEP_FIELDS, max_bytes=DEFAULT_SWEEP_BYTES):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        self.axes = {}
+        for name, values in zip(SWEEP_AXES, (wind_speed, wind_direction, latitude, depth)):
+            values = self.calculator._asarray(values).reshape(-1)
+            if values.size == 0:
+                raise ValueError(f"{name} 축이 비어 있습니다")
+            self.axes[name] = values
+        unknown = [field for field in fields if field not in SWEEP_FIELDS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 결과 항목입니다: {unknown} (가능: {SWEEP_FIELDS})")
+        self.fields = tuple(fields)
+        self.max_bytes = max_bytes
+
+    @property
+    def shape(self):
+        return tuple(values.size for values in self.axes.values())
+
+    @property
+    def size(self):
+        return math.prod(self.shape)
+
+    def iter_chunks(self):
+        """(큐브 인덱스, {항목: 청크 배열}) 를 C 순서로 생성
+
+        각 청크는 큐브에서 C 순서로 연속된 부분이며, 청크 크기는 모든 일괄 계산 결과
+        (SWEEP_FIELDS)가 max_bytes 안에 들어가도록 정합니다.
+        """
+        shape = self.shape
+        ndim = len(shape)
+        itemsize = self.calculator._asarray(0).itemsize
+        max_points = max(1, self.max_bytes // (len(SWEEP_FIELDS) * itemsize))
+
+        # 뒤쪽 축 전체가 예산에 들어가는 가장 앞쪽 축을 청크 축으로 사용
+        axis = 0
+        while axis < ndim - 1 and math.prod(shape[axis + 1:]) > max_points:
+            axis += 1
+        step = max(1, max_points // math.prod(shape[axis + 1:]))
+
+        for lead in np.ndindex(*shape[:axis]):
+            for start in range(0, shape[axis], step):
+                index = (tuple(slice(i, i + 1) for i in lead)
+                         + (slice(start, min(start + step, shape[axis])),)
+                         + (slice(None),) * (ndim - axis - 1))
+                yield index, self._compute_block(index)
+
+    def _compute_block(self, index):
+        """큐브 부분에 대한 브로드캐스팅 일괄 계산"""
+        ndim = len(self.axes)
+        inputs = []
+        for i, values in enumerate(self.axes.values()):
+            axis_shape = [1] * ndim
+            axis_shape[i] = -1
+            inputs.append(values[index[i]].reshape(axis_shape))
+        block_shape = tuple(x.size for x in inputs)
+        batch = self.calculator.subset(index, self.shape).calculate_ekman_transport_batch(*inputs)
+        return {field: np.broadcast_to(batch[field], block_shape) for field in self.fields}
+
+    def compute(self, out=None):
+        """전체 큐브 계산
+
+        Args:
+            out: 출력 {항목: 배열} 딕셔너리 (np.memmap 가능, 기본값은 새로 할당)
+
+        Returns:
+            SweepResult
+        """
+        if out is None:
+            dtype = self.calculator._asarray(0).dtype
+            out = {field: np.empty(self.shape, dtype=dtype) for field in self.fields}
+        for index, block in self.iter_chunks():
+            for field in self.fields:
+                out[field][index] = block[field]
+        return SweepResult(dict(self.axes), out)
+
+    def _coordinate_columns(self, index):
+        """청크의 축 값 열 (C 순서로 펼친 배열 목록)"""
+        grids = np.meshgrid(*(values[i] for values, i in zip(self.axes.values(), index)), indexing='ij')
+        return [grid.reshape(-1) for grid in grids]
+
+    def to_csv(self, path, fmt='%.10g', delimiter=','):
+        """축 값과 결과 항목을 열로 하는 CSV 파일로 청크 단위 저장 (행: 큐브의 C 순서)"""
+        with open(path, 'w') as f:
+            f.write(delimiter.join(SWEEP_AXES + self.fields) + '\n')
+            for index, block in self.iter_chunks():
+                columns = self._coordinate_columns(index) + [block[field].reshape(-1) for field in self.fields]
+                np.savetxt(f, np.column_stack(columns), fmt=fmt, delimiter=delimiter)
+        return path
+
+    def to_npz(self, path):
+        """SweepResult.to_npz 와 같은 형식의 NPZ 파일로 청크 단위 저장
+
+        청크마다 항목별 임시 파일에 이어 쓴 뒤 .npy 항목으로 압축 파일에 복사하므로
+        큐브 전체를 메모리에 만들지 않습니다.
+        """
+        if isinstance(path, str) and not path.endswith('.npz'):
+            path += '.npz'  # np.savez 와 같은 확장자 처리
+        dtype = self.calculator._asarray(0).dtype
+        spools = {field: tempfile.TemporaryFile() for field in self.fields}
+        try:
+            for _, block in self.iter_chunks():
+                for field in self.fields:
+                    spools[field].write(np.ascontiguousarray(block[field]).tobytes())
+
+            with zipfile.ZipFile(path, 'w', allowZip64=True) as archive:
+                for name, values in self.axes.items():
+                    with archive.open(f'axis_{name}.npy', 'w', force_zip64=True) as entry:
+                        np.lib.format.write_array(entry, values)
+                for field, spool in spools.items():
+                    header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                              'shape': self.shape}
+                    with archive.open(f'{field}.npy', 'w', force_zip64=True) as entry:
+                        np.lib.format.write_array_header_2_0(entry, header)
+                        spool.seek(0)
+                        shutil.copyfileobj(spool, entry)
+        finally:
+            for spool in spools.values():
+                spool.close()
+        return path
@@ -0,0 +1,99 @@
+"""
+메모리 매핑(np.memmap) 기반 타일 단위 에크만 수송 계산 모듈
+
+메모리에 올릴 수 없는 (time, lat, lon) 바람 큐브를 타일 단위로 읽어 계산하고,
+결과를 메모리 매핑된 출력 파일에 바로 기록합니다.
+"""
+
+import os
+import numpy as np
+from ekman_grid import EkmanGridEngine
+
+# 입력과 같은 shape을 갖는 출력 장
+GRID_FIELDS = ('wind_speed', 'wind_stress', 'tau_x', 'tau_y', 'Mx', 'My', 'energy_transfer_rate')
+DEFAULT_TILE_BYTES = 16 * 1024 * 1024  # 입력 성분 하나당 타일 크기 목표 (16 MiB)
+
+
+def resolve_time_chunk(step_elements, itemsize, time_chunk=None, chunk_bytes=DEFAULT_TILE_BYTES):
+    """시간 청크 길이
+
+    time_chunk 를 지정하지 않으면 시간 단계 하나가 step_elements 개 원소인 입력 성분
+    하나의 청크가 chunk_bytes 이내가 되도록 정합니다 (NetCDF 리더, 용승 관측소 공통).
+    """
+    if time_chunk is not None:
+        return max(1, int(time_chunk))
+    return max(1, chunk_bytes // (step_elements * itemsize))
+
+
+class TiledEkmanExecutor:
+    """(time, lat, lon) 입력을 타일 단위로 순회하며 에크만 수송을 계산합니다.
+
+    타일은 C 순서(time → lat → lon)로 순회하므로, 경도 전체를 덮는 타일(기본값)은
+    디스크상에서 연속된 블록 하나로 읽히고 쓰입니다. 각 원소의 계산은 메모리 내
+    EkmanGridEngine.compute 와 동일한 연산이므로 결과는 비트 단위로 같습니다.
+    """
+
+    def __init__(self, engine=None, tile_shape=None, tile_bytes=DEFAULT_TILE_BYTES):
+        self.engine = engine if engine is not None else EkmanGridEngine()
+        self.tile_shape = tile_shape
+        self.tile_bytes = tile_bytes
+
+    def resolve_tile_shape(self, shape, itemsize=8):
+        """타일 shape 결정 (지정하지 않으면 경도 전체 행을 tile_bytes 안에서 최대한 묶음)"""
+        nt, ny, nx = shape
+        if self.tile_shape is not None:
+            tt, ty, tx = self.tile_shape
+            return min(tt or nt, nt), min(ty or ny, ny), min(tx or nx, nx)
+        rows = max(1, self.tile_bytes // (nx * itemsize))
+        if rows >= ny:
+            return max(1, min(nt, rows // ny)), ny, nx
+        return 1, rows, nx
+
+    def iter_tiles(self, shape, itemsize=8):
+        """타일 슬라이스 (time, lat, lon)를 C 순서로 생성"""
+        tt, ty, tx = self.resolve_tile_shape(shape, itemsize)
+        nt, ny, nx = shape
+        for t0 in range(0, nt, tt):
+            for y0 in range(0, ny, ty):
+                for x0 in range(0, nx, tx):
+                    yield (slice(t0, t0 + tt), slice(y0, y0 + ty), slice(x0, x0 + tx))
+
+    @staticmethod
+    def create_outputs(out_dir, shape, fields=GRID_FIELDS, dtype=np.float64):
+        """출력 장마다 메모리 매핑된 .npy 파일(<out_dir>/<field>.npy) 생성"""
+        os.makedirs(out_dir, exist_ok=True)
+        return {
+            field: np.lib.format.open_memmap(os.path.join(out_dir, f'{field}.npy'), mode='w+',
+                                             dtype=dtype, shape=tuple(shape))
+            for field in fields
+        }
+
+    def run(self, u, v, latitude, out, fields=GRID_FIELDS):
+        """타일 단위 계산 실행
+
+        Args:
+            u, v: (time, lat, lon) 바람 성분 (np.memmap 권장)
+            latitude: 위도 벡터, shape (lat,)
+            out: 출력 디렉터리 경로 또는 {field: 배열} 딕셔너리 (np.memmap 권장)
+            fields: out 이 경로일 때 생성할 출력 장
+
+        Returns:
+            dict: 출력 장 딕셔너리
+        """
+        if u.shape != v.shape or u.ndim != 3:
+            raise ValueError(f"u, v는 같은 shape의 (time, lat, lon) 배열이어야 합니다: {u.shape}, {v.shape}")
+        latitude = np.asarray(latitude, dtype=float)
+        if isinstance(out, (str, os.PathLike)):
+            # 출력 파일은 계산 정밀도(calculator.dtype)로 생성
+            out = self.create_outputs(out, u.shape, fields, dtype=self.engine.calculator.dtype)
+
+        for tile in self.iter_tiles(u.shape, np.dtype(u.dtype).itemsize):
+            _, lat_slice, _ = tile
+            tile_fields = self.engine.compute(u[tile], v[tile], latitude[lat_slice], index=tile, shape=u.shape)
+            for field, array in out.items():
+                array[tile] = tile_fields[field]
+
+        for array in out.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+        return out
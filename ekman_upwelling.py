@@ -0,0 +1,227 @@
+"""
+연안 용승 지수 (Bakun, 1973) 계산 모듈
+
+관측소(연안 지점)마다 위도와 해안선 방향을 받아, 바람 시계열로부터 계산한
+에크만 수송을 외해 방향 법선에 투영한 용승 지수 시계열을 구합니다.
+관측소와 시간 축 모두 벡터화되어 있으며, 시간 축은 청크 단위로 계산하므로
+np.memmap 입력/출력으로 수천 개 관측소 × 수십 년 자료도 메모리에 올리지 않고 처리합니다.
+
+계산기의 수송식(Mx = -τy/(ρf), My = τx/(ρf))은 북반구에서 바람의 왼쪽을 향하므로,
+용승 지수는 그 반대인 물리적 에크만 수송 (-Mx, -My) (북반구에서 바람의 오른쪽)을
+투영합니다. 양수가 외해 수송(용승)으로, Bakun/PFEL 지수 및 ekman_pumping 의
+부호(양수 = 용승)와 같습니다.
+"""
+
+import json
+
+import numpy as np
+from ekman_calculations import EkmanTransportCalculator
+from ekman_tiled import DEFAULT_TILE_BYTES, resolve_time_chunk
+
+BAKUN_COASTLINE_LENGTH = 100.0  # m (용승 지수 단위: 해안선 100 m 당 m³/s)
+UPWELLING_FIELDS = ('offshore_transport', 'alongshore_transport', 'upwelling_index')
+
+
+class UpwellingStations:
+    """연안 관측소 집합에 대한 용승 지수 계산
+
+    방향은 바람 방향과 같은 규약(0° = 동쪽, 90° = 북쪽, 반시계 방향)의 '향하는' 방향입니다.
+
+    Args:
+        latitude: 관측소 위도 (도), shape (n_stations,)
+        offshore_direction: 해안에서 외해로 향하는 법선 방향 (도), shape (n_stations,)
+        names: 관측소 이름 목록 (선택)
+        calculator: EkmanTransportCalculator (상수, 항력 공식, 적도 처리, 정밀도 설정)
+    """
+
+    def __init__(self, latitude, offshore_direction, names=None, calculator=None):
+        self.calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        latitude, offshore_direction = np.broadcast_arrays(
+            *(np.atleast_1d(self.calculator._asarray(x)) for x in (latitude, offshore_direction)))
+        if latitude.ndim != 1:
+            raise ValueError(f"관측소 위도/방향은 1차원 배열이어야 합니다: {latitude.shape}")
+        if names is not None and len(names) != latitude.size:
+            raise ValueError(f"관측소 이름 수 {len(names)}가 관측소 수 {latitude.size}와 다릅니다")
+        self.latitude = latitude
+        self.offshore_direction = offshore_direction
+        self.names = list(names) if names is not None else None
+        offshore_rad = np.radians(offshore_direction)
+        # 외해 단위 법선 n 과 해안선 방향 단위 벡터 s (외해를 오른쪽에 둔 방향, s = n 을 +90° 회전)
+        self._normal = (np.cos(offshore_rad), np.sin(offshore_rad))
+        self._alongshore = (-self._normal[1], self._normal[0])
+
+    @classmethod
+    def from_coastline(cls, latitude, coastline_direction, names=None, calculator=None):
+        """해안선 방향(바다를 오른쪽에 두고 해안을 따라 걷는 방향, 도)으로 관측소 생성
+
+        외해 법선은 해안선 방향에서 시계 방향으로 90° 입니다.
+        """
+        return cls(latitude, np.mod(np.asarray(coastline_direction, dtype=float) - 90, 360),
+                   names=names, calculator=calculator)
+
+    @property
+    def n_stations(self):
+        return self.latitude.size
+
+    def resolve_time_chunk(self, time_chunk=None, chunk_bytes=DEFAULT_TILE_BYTES):
+        """시간 청크 길이 (ekman_tiled.resolve_time_chunk 참고)"""
+        return resolve_time_chunk(self.n_stations, self.calculator._asarray(0).itemsize, time_chunk, chunk_bytes)
+
+    def _transport(self, u, v, index=None, shape=None):
+        """바람 성분 청크 (nt, n_stations) 에 대한 물리적 에크만 수송 (-Mx, -My)
+
+        계산기 수송식의 부호를 바꾼 값입니다 (모듈 설명 참고). index, shape 은 EkmanGridEngine.compute 와 같이 항력 공식의 격자 자료를 자를 때 사용합니다.
+        """
+        calc = self.calculator if index is None else self.calculator.subset(index, shape)
+        f, r = calc.coriolis_and_friction(self.latitude)
+        _, _, tau_x, tau_y = calc._wind_stress_from_components(calc._asarray(u), calc._asarray(v))
+        Mx, My, _ = calc._transport_from_stress(tau_x, tau_y, f, r)
+        return -Mx, -My
+
+    def compute(self, u, v, out=None, time_chunk=None):
+        """관측소별 용승 지수 시계열
+
+        Args:
+            u, v: 동서/남북 바람 성분 (m/s), shape (n_times, n_stations) (np.memmap 가능)
+            out: 출력 {항목: 배열} 딕셔너리 (np.memmap 가능, 기본값은 새로 할당)
+            time_chunk: 한 번에 계산할 시간 단계 수 (기본값: resolve_time_chunk)
+
+        Returns:
+            dict: 'offshore_transport' (m²/s, 양수 = 외해 방향), 'alongshore_transport'
+            (m²/s), 'upwelling_index' (해안선 100 m 당 m³/s, 양수 = 용승), shape (n_times, n_stations).
+            수송은 물리적 에크만 수송 (-Mx, -My) 의 투영입니다 (모듈 설명 참고)
+        """
+        if u.shape != v.shape or u.ndim != 2 or u.shape[1] != self.n_stations:
+            raise ValueError(f"u, v는 (시간, 관측소={self.n_stations}) shape이어야 합니다: {u.shape}, {v.shape}")
+        if out is None:
+            dtype = self.calculator._asarray(0).dtype
+            out = {field: np.empty(u.shape, dtype=dtype) for field in UPWELLING_FIELDS}
+
+        step = self.resolve_time_chunk(time_chunk)
+        nx, ny = self._normal
+        sx, sy = self._alongshore
+        for start in range(0, u.shape[0], step):
+            window = slice(start, start + step)
+            Ex, Ey = self._transport(u[window], v[window], index=window, shape=u.shape)
+            offshore = Ex * nx + Ey * ny
+            if 'offshore_transport' in out:
+                out['offshore_transport'][window] = offshore
+            if 'alongshore_transport' in out:
+                out['alongshore_transport'][window] = Ex * sx + Ey * sy
+            if 'upwelling_index' in out:
+                out['upwelling_index'][window] = offshore * BAKUN_COASTLINE_LENGTH
+        return out
+
+    def compute_from_speed_direction(self, wind_speed, wind_direction, out=None, time_chunk=None):
+        """바람 속도/방향 (n_times, n_stations) 시계열에 대한 compute"""
+        wind_speed = self.calculator._asarray(wind_speed)
+        wind_direction_rad = np.radians(self.calculator._asarray(wind_direction))
+        return self.compute(wind_speed * np.cos(wind_direction_rad), wind_speed * np.sin(wind_direction_rad),
+                            out=out, time_chunk=time_chunk)
+
+
+class UpwellingAccumulator:
+    """실시간 감시용 누적/이동 창 용승 지수 누적기
+
+    새 바람 표본이 들어올 때마다 관측소당 O(1) 연산으로 누적 용승 지수(Σ 지수·dt)와
+    최근 window 개 표본의 이동 평균을 갱신합니다. 이동 합은 링 버퍼로 관리하며,
+    버퍼가 한 바퀴 돌 때마다 다시 합산하여 반올림 오차가 쌓이지 않게 합니다.
+    결측(NaN) 표본은 누적과 평균에서 제외됩니다. save()/load() 로 상태를 저장하고 이어서
+    계산할 수 있습니다.
+
+    Args:
+        stations: UpwellingStations
+        window: 이동 창 길이 (표본 수)
+        dt: 표본 간격 (s)
+    """
+
+    def __init__(self, stations, window=24, dt=3600.0):
+        if window < 1:
+            raise ValueError(f"이동 창 길이는 1 이상이어야 합니다: {window}")
+        self.stations = stations
+        self.window = int(window)
+        self.dt = float(dt)
+        self.reset()
+
+    def reset(self):
+        """누적 상태 초기화 (예: 매년 1월 1일)"""
+        n = self.stations.n_stations
+        self.count = 0
+        self.cumulative = np.zeros(n)
+        self._buffer = np.zeros((self.window, n))
+        self._valid = np.zeros((self.window, n), dtype=bool)
+        self._rolling_sum = np.zeros(n)
+        self._rolling_count = np.zeros(n, dtype=np.int64)
+        self._position = 0
+
+    @property
+    def rolling_mean(self):
+        """최근 window 개 표본의 관측소별 평균 용승 지수 (유효 표본이 없으면 NaN)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self._rolling_count > 0, self._rolling_sum / self._rolling_count, np.nan)
+
+    def update(self, u, v):
+        """새 바람 성분 표본 추가
+
+        Args:
+            u, v: 동서/남북 바람 성분 (m/s), shape (n_stations,) 또는 여러 표본 (k, n_stations)
+
+        Returns:
+            np.ndarray: 추가한 표본의 용승 지수, shape (k, n_stations)
+        """
+        u = np.atleast_2d(u)
+        v = np.atleast_2d(v)
+        index = self.stations.compute(u, v, out={'upwelling_index': np.empty(u.shape)})['upwelling_index']
+        for sample in index:
+            self._push(sample)
+        return index
+
+    def _push(self, sample):
+        valid = ~np.isnan(sample)
+        value = np.where(valid, sample, 0.0)
+        position = self._position
+        self.cumulative += value * self.dt
+        self._rolling_sum += value - self._buffer[position]
+        self._rolling_count += valid.astype(np.int64) - self._valid[position]
+        self._buffer[position] = value
+        self._valid[position] = valid
+        self.count += 1
+        self._position = (position + 1) % self.window
+        if self._position == 0:
+            # 한 바퀴마다 다시 합산 (표본당 분할 상환 O(1))
+            self._rolling_sum = self._buffer.sum(axis=0)
+
+    def save(self, path):
+        """상태를 NPZ 파일로 저장 (계산기 물리 설정 포함)"""
+        np.savez(path, latitude=self.stations.latitude, offshore_direction=self.stations.offshore_direction,
+                 settings=json.dumps(self.stations.calculator.settings()),
+                 window=self.window, dt=self.dt, count=self.count, position=self._position,
+                 cumulative=self.cumulative, buffer=self._buffer, valid=self._valid,
+                 rolling_sum=self._rolling_sum, rolling_count=self._rolling_count)
+
+    @classmethod
+    def load(cls, path, calculator=None, names=None):
+        """save() 로 저장한 상태에서 누적기 복원
+
+        calculator 의 물리 설정(calculator.settings(), 기본값은 기본 계산기)이 저장할 때와
+        다르면 다른 물리로 이어서 계산하게 되므로 ValueError 를 발생시킵니다.
+        """
+        calculator = calculator if calculator is not None else EkmanTransportCalculator()
+        with np.load(path) as state:
+            saved = json.loads(str(state['settings']))
+            current = calculator.settings()
+            if current != saved:
+                different = sorted(key for key in saved.keys() | current.keys() if saved.get(key) != current.get(key))
+                raise ValueError(f"체크포인트의 계산기 설정과 다릅니다: {different} "
+                                 f"(저장 시 설정의 계산기를 calculator 로 넘기세요)")
+            stations = UpwellingStations(state['latitude'], state['offshore_direction'],
+                                         names=names, calculator=calculator)
+            accumulator = cls(stations, window=int(state['window']), dt=float(state['dt']))
+            accumulator.count = int(state['count'])
+            accumulator._position = int(state['position'])
+            accumulator.cumulative = state['cumulative'].copy()
+            accumulator._buffer = state['buffer'].copy()
+            accumulator._valid = state['valid'].copy()
+            accumulator._rolling_sum = state['rolling_sum'].copy()
+            accumulator._rolling_count = state['rolling_count'].copy()
+        return accumulator
@@ -0,0 +1,213 @@
+"""
+청크 단위 결과 스트리밍 기록기 (NPZ 샤드, 메모리 매핑/원시 이진 파일, CSV)
+
+계산 루프는 write() 로 결과 청크({항목: 배열})를 대기열에 넣기만 하고, 실제 디스크
+쓰기는 백그라운드 스레드가 처리합니다. 대기열 길이(max_pending)로 메모리 사용량이
+제한되며, 디스크가 계산보다 느릴 때만 write() 가 대기합니다. 압축(zlib)과 파일 쓰기는
+GIL 을 놓으므로 계산과 동시에 진행됩니다.
+
+write() 에 넘긴 배열은 기록이 끝날 때까지 수정하지 않아야 합니다
+(EkmanGridEngine.compute 등은 매번 새 배열을 반환하므로 그대로 넘기면 됩니다).
+"""
+
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+from ekman_tiled import GRID_FIELDS, TiledEkmanExecutor
+
+DEFAULT_MAX_PENDING = 4                 # 대기열에 쌓일 수 있는 청크 수
+DEFAULT_SHARD_BYTES = 64 * 2 ** 20      # NPZ 샤드 하나의 (압축 전) 목표 크기
+DEFAULT_BUFFER_BYTES = 8 * 2 ** 20      # CSV 파일 쓰기 버퍼
+_CLOSE = object()
+
+
+class BackgroundWriter:
+    """백그라운드 스레드 기록기의 공통 부분
+
+    하위 클래스는 _write(chunk, index), _finish() (정상 종료 시 남은 자료 기록),
+    _release() (오류가 있어도 항상 호출, 파일 닫기) 를 구현합니다.
+    with 문으로 사용하면 끝날 때 남은 청크를 모두 기록하고 파일을 닫습니다.
+    """
+
+    def __init__(self, fields=GRID_FIELDS, max_pending=DEFAULT_MAX_PENDING):
+        self.fields = tuple(fields)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def write(self, chunk, index=None):
+        """결과 청크를 기록 대기열에 추가
+
+        Args:
+            chunk: {항목: 배열} 딕셔너리 (fields 외의 항목은 무시)
+            index: 기록 위치 (MemmapWriter 에서만 사용, 예: 시간 슬라이스나 타일)
+        """
+        self._raise_error()
+        if self._closed:
+            raise ValueError("이미 닫힌 기록기입니다")
+        missing = [field for field in self.fields if field not in chunk]
+        if missing:
+            raise ValueError(f"청크에 없는 항목입니다: {missing}")
+        self._queue.put(({field: chunk[field] for field in self.fields}, index))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                break
+            if self._error is None:
+                try:
+                    self._write(*item)
+                except Exception as e:  # 오류는 다음 write()/close() 에서 다시 발생
+                    self._error = e
+        try:
+            if self._error is None:
+                self._finish()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._release()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"{type(self).__name__} 기록 중 오류가 발생했습니다: {self._error}") from self._error
+
+    def close(self):
+        """남은 청크를 모두 기록하고 파일을 닫음"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, chunk, index):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+    def _release(self):
+        pass
+
+
+class NPZShardWriter(BackgroundWriter):
+    """결과 청크를 모아 압축 NPZ 샤드 (<directory>/<prefix>_00000.npz, ...) 로 기록
+
+    청크는 첫 번째 축(시간/표본)을 따라 이어 붙여지며, 모인 크기가 shard_bytes 를
+    넘을 때마다 샤드 하나를 씁니다. 샤드 파일 목록은 self.paths 에 기록됩니다.
+    """
+
+    def __init__(self, directory, prefix='shard', fields=GRID_FIELDS, shard_bytes=DEFAULT_SHARD_BYTES,
+                 compress=True, max_pending=DEFAULT_MAX_PENDING):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_bytes = shard_bytes
+        self.compress = compress
+        self.paths = []
+        self._pending = []
+        self._pending_bytes = 0
+        super().__init__(fields, max_pending)
+
+    def _write(self, chunk, index):
+        self._pending.append(chunk)
+        self._pending_bytes += sum(np.asarray(array).nbytes for array in chunk.values())
+        if self._pending_bytes >= self.shard_bytes:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        arrays = {field: np.concatenate([np.atleast_1d(chunk[field]) for chunk in self._pending])
+                  for field in self.fields}
+        path = os.path.join(self.directory, f'{self.prefix}_{len(self.paths):05d}.npz')
+        save = np.savez_compressed if self.compress else np.savez
+        save(path, **arrays)
+        self.paths.append(path)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def _finish(self):
+        self._flush()
+
+
+class MemmapWriter(BackgroundWriter):
+    """미리 할당한 항목별 파일에 결과 청크를 기록
+
+    Args:
+        directory: 출력 디렉터리
+        shape: 전체 출력 shape
+        fmt: 'npy' (<field>.npy, np.load(mmap_mode='r') 로 열 수 있음) 또는
+            'raw' (<field>.bin 원시 이진 파일, shape/dtype 은 layout.json 에 기록)
+        dtype: 출력 정밀도
+
+    write(chunk, index) 의 index 위치에 기록하며, index 가 None이면 첫 번째 축을 따라
+    순서대로 이어서 기록합니다.
+    """
+
+    def __init__(self, directory, shape, fields=GRID_FIELDS, fmt='npy', dtype=np.float64,
+                 max_pending=DEFAULT_MAX_PENDING):
+        if fmt not in ('npy', 'raw'):
+            raise ValueError(f"fmt는 'npy' 또는 'raw'여야 합니다: {fmt}")
+        shape = tuple(shape)
+        if fmt == 'npy':
+            self.outputs = TiledEkmanExecutor.create_outputs(directory, shape, fields, dtype=dtype)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.outputs = {field: np.memmap(os.path.join(directory, f'{field}.bin'), mode='w+',
+                                             dtype=dtype, shape=shape)
+                            for field in fields}
+            layout = {field: {'shape': list(shape), 'dtype': np.dtype(dtype).str} for field in fields}
+            with open(os.path.join(directory, 'layout.json'), 'w', encoding='utf-8') as f:
+                json.dump(layout, f, indent=2)
+        self.directory = directory
+        self.shape = shape
+        self._offset = 0
+        super().__init__(fields, max_pending)
+
+    def _write(self, chunk, index):
+        if index is None:
+            length = np.shape(chunk[self.fields[0]])[0]
+            index = slice(self._offset, self._offset + length)
+            self._offset += length
+        for field, array in chunk.items():
+            self.outputs[field][index] = array
+
+    def _finish(self):
+        for array in self.outputs.values():
+            array.flush()
+
+
+class CSVWriter(BackgroundWriter):
+    """결과 청크를 항목별 열로 펼쳐 CSV 파일에 이어 쓰기 (행: 각 청크의 C 순서)"""
+
+    def __init__(self, path, fields=GRID_FIELDS, fmt='%.10g', delimiter=',', buffer_bytes=DEFAULT_BUFFER_BYTES,
+                 max_pending=DEFAULT_MAX_PENDING):
+        self.path = path
+        self.fmt = fmt
+        self.delimiter = delimiter
+        self._file = open(path, 'w', encoding='utf-8', buffering=buffer_bytes)
+        self._file.write(delimiter.join(fields) + '\n')
+        super().__init__(fields, max_pending)
+
+    def _write(self, chunk, index):
+        arrays = np.broadcast_arrays(*(np.asarray(chunk[field]) for field in self.fields))
+        np.savetxt(self._file, np.column_stack([array.reshape(-1) for array in arrays]),
+                   fmt=self.fmt, delimiter=self.delimiter)
+
+    def _finish(self):
+        self._file.flush()
+
+    def _release(self):
+        self._file.close()
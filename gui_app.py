@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, font, messagebox, filedialog
 from ekman_calculations import EkmanTransportCalculator
+from ekman_similarity import SimilarityEvaluator
 from translations import translations
 from pdf_report import create_pdf_report
 import numpy as np
@@ -23,6 +24,8 @@ class EkmanApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.calculator = EkmanTransportCalculator()
+        # 바람 속도/방향 슬라이더 변경 시 단위 해를 스케일/회전만 하여 계산
+        self.evaluator = SimilarityEvaluator(self.calculator)
         self.language = tk.StringVar(value='en')
         self.language.trace_add('write', self.change_language)
         
@@ -265,7 +268,7 @@ class EkmanApp(tk.Tk):
             tk.messagebox.showwarning(t['error_title'], t['error_msg'])
             self.latitude_var.set(1)
 
-        results = self.calculator.calculate_ekman_transport(
+        results = self.evaluator.evaluate(
             wind_speed=self.wind_speed_var.get(),
             wind_direction=self.wind_direction_var.get(),
             latitude=self.latitude_var.get(),
@@ -8,7 +8,7 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
-from ekman_calculations import EkmanTransportCalculator
+from ekman_memo import MemoizedEkmanCalculator
 from translations import translations
 import pandas as pd
 
@@ -57,10 +57,10 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# 계산기 초기화
+# 계산기 초기화 (슬라이더 눈금/프리셋으로 반복되는 시나리오는 캐시된 결과 사용)
 @st.cache_resource
 def get_calculator():
-    return EkmanTransportCalculator()
+    return MemoizedEkmanCalculator()
 
 calc = get_calculator()
 
@@ -3,8 +3,32 @@
 에크만 수송 계산 테스트 스크립트
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from ekman_calculations import EkmanTransportCalculator
+from ekman_cache import LRUCache
+from ekman_calculations import FLOAT32_RTOL, EkmanTransportCalculator
+from ekman_grid import EkmanGridEngine
+from ekman_pumping import EARTH_RADIUS, ekman_pumping_velocity, spherical_curl, spherical_divergence
+from ekman_stream import read_wind_csv_chunks, stream_ekman_transport
+from ekman_tiled import TiledEkmanExecutor
+from ekman_parallel import ParallelEkmanExecutor
+from ekman_result import RECORD_FIELDS, to_records
+from ekman_solver import EkmanColumnSolver
+from ekman_slab import SlabEkmanModel
+import ekman_drag
+from ekman_drag import BulkStabilityDrag, ConstantDrag, LargePondDrag, SaturatingDrag
+from ekman_ensemble import EkmanEnsemble
+from ekman_sweep import EkmanSweep
+from ekman_inverse import EkmanInverseSolver
+from ekman_netcdf import NetCDFWindReader
+from ekman_writers import CSVWriter, MemmapWriter, NPZShardWriter
+from ekman_upwelling import UpwellingAccumulator, UpwellingStations
+from ekman_similarity import SimilarityEvaluator
+from ekman_memo import MemoizedEkmanCalculator
 
 def test_ekman_calculations():
     """에크만 수송 계산 테스트"""
@@ -102,5 +126,725 @@ def test_ekman_calculations():
     except Exception as e:
         print(f"❌ 3D 시각화 생성 실패: {e}")
 
+
+def test_batch_matches_scalar():
+    """배열 일괄 계산이 스칼라 계산과 동일한지 테스트"""
+    calculator = EkmanTransportCalculator()
+    rng = np.random.default_rng(0)
+    wind_speed = rng.uniform(0, 30, 200)
+    wind_direction = rng.uniform(0, 360, 200)
+    latitude = rng.uniform(-90, 90, 200)
+    latitude[:3] = 0
+    depth = rng.uniform(10, 1000, 200)
+
+    batch = calculator.calculate_ekman_transport_batch(wind_speed, wind_direction, latitude, depth)
+    for i in range(len(wind_speed)):
+        results = calculator.calculate_ekman_transport(wind_speed[i], wind_direction[i], latitude[i], depth[i])
+        for key, values in batch.items():
+            assert values[i] == results[key], key
+
+
+def test_grid_matches_scalar():
+    """격자 엔진이 셀별 스칼라 계산을 재현하는지 테스트"""
+    calculator = EkmanTransportCalculator()
+    engine = EkmanGridEngine(calculator)
+    rng = np.random.default_rng(1)
+    latitude = np.linspace(-80, 80, 9)
+    u = rng.normal(0, 8, (2, 9, 4))
+    v = rng.normal(0, 8, (2, 9, 4))
+
+    fields = engine.compute(u, v, latitude)
+    for index in np.ndindex(u.shape):
+        results = calculator.calculate_ekman_transport(
+            np.hypot(u[index], v[index]), np.degrees(np.arctan2(v[index], u[index])), latitude[index[1]], 100)
+        for key in ('Mx', 'My', 'tau_x', 'tau_y', 'energy_transfer_rate'):
+            assert np.isclose(fields[key][index], results[key], rtol=1e-12, atol=0), key
+        assert fields['f'][index[1]] == results['f']
+
+
+def test_spherical_curl():
+    """구면 컬이 해석해와 일치하고 주기 경계 및 육지 마스크를 처리하는지 테스트"""
+    latitude = np.linspace(-88, 88, 89)
+    longitude = np.arange(0, 360, 2.0)
+    phi = np.radians(latitude)[:, np.newaxis]
+    lam = np.radians(longitude)[np.newaxis, :]
+    Fx = np.cos(phi) * np.ones_like(lam)
+    Fy = np.sin(lam) * np.ones_like(phi)
+    expected = (2 * np.sin(phi) + np.cos(lam) / np.cos(phi)) / EARTH_RADIUS
+
+    curl = spherical_curl(Fx, Fy, latitude, longitude)
+    assert np.allclose(curl[1:-1], expected[1:-1], rtol=0, atol=1e-3 * np.abs(expected).max())
+
+    # 육지 격자만 NaN이고, 인접 해양 격자는 한쪽 차분 (1차 정확도)
+    mask = np.zeros(Fx.shape, dtype=bool)
+    mask[40, 0] = True
+    mask[10:13, 20:23] = True
+    curl = spherical_curl(Fx, Fy, latitude, longitude, mask=mask)
+    assert np.array_equal(np.isnan(curl[1:-1]), mask[1:-1])
+    assert np.allclose(curl[1:-1][~mask[1:-1]], expected[1:-1][~mask[1:-1]], rtol=0, atol=5e-3 * np.abs(expected).max())
+    assert curl[40, 2] == spherical_curl(Fx, Fy, latitude, longitude)[40, 2]
+
+    # 에크만 펌핑은 격자 엔진 수송량의 수렴 -div(Mx, My) 와 같음 (적도 마찰 포함)
+    calculator = EkmanTransportCalculator()
+    band = np.linspace(-10, 10, 41)
+    u = np.broadcast_to(8 * np.cos(lam), (band.size, longitude.size))
+    v = 3 * np.sin(2 * lam) * np.cos(np.radians(band))[:, np.newaxis]
+    for mode in (None, 'friction'):
+        calculator.equatorial_mode = mode
+        fields = EkmanGridEngine(calculator).compute(u, v, band)
+        pumping = ekman_pumping_velocity(fields['tau_x'], fields['tau_y'], band, longitude, calculator)
+        convergence = -spherical_divergence(fields['Mx'], fields['My'], band, longitude)
+        assert np.allclose(pumping, convergence, rtol=0, atol=1e-9 * np.abs(convergence).max()), mode
+
+
+def test_stream_matches_batch(tmp_path):
+    """청크 스트리밍 결과가 전체 일괄 계산과 같은지 테스트"""
+    calculator = EkmanTransportCalculator()
+    rng = np.random.default_rng(2)
+    wind = np.column_stack([rng.uniform(0, 25, 1000), rng.uniform(0, 360, 1000)])
+    path = tmp_path / 'station.csv'
+    np.savetxt(path, wind, delimiter=',', header='speed,direction', fmt='%.17g')
+
+    chunks = read_wind_csv_chunks(path, chunk_size=128, skiprows=1)
+    streamed = list(stream_ekman_transport(chunks, 35.1, calculator=calculator))
+    batch = calculator.calculate_ekman_transport_batch(wind[:, 0], wind[:, 1], 35.1, 100.0)
+    assert len(streamed) == 8
+    for key, values in batch.items():
+        assert np.array_equal(np.concatenate([chunk[key] for chunk in streamed]), values), key
+
+
+def test_tiled_memmap_matches_in_memory(tmp_path):
+    """메모리 매핑 타일 계산 결과가 메모리 내 계산과 비트 단위로 같은지 테스트"""
+    rng = np.random.default_rng(3)
+    shape = (3, 10, 12)
+    latitude = np.linspace(-45, 45, 10)
+    u = np.lib.format.open_memmap(tmp_path / 'u.npy', mode='w+', shape=shape)
+    v = np.lib.format.open_memmap(tmp_path / 'v.npy', mode='w+', shape=shape)
+    u[:] = rng.normal(0, 8, shape)
+    v[:] = rng.normal(0, 8, shape)
+
+    executor = TiledEkmanExecutor(tile_shape=(2, 4, 5))
+    out = executor.run(u, v, latitude, tmp_path / 'out')
+    expected = executor.engine.compute(np.asarray(u), np.asarray(v), latitude)
+    for field, array in out.items():
+        assert isinstance(array, np.memmap)
+        assert np.array_equal(array, expected[field]), field
+
+
+def test_parallel_matches_serial():
+    """공유 메모리 병렬 계산 결과가 단일 프로세스 계산과 같은지 테스트"""
+    rng = np.random.default_rng(4)
+    latitude = np.linspace(-60, 60, 16)
+    u = rng.normal(0, 8, (3, 16, 20))
+    v = rng.normal(0, 8, (3, 16, 20))
+    expected = EkmanGridEngine().compute(u, v, latitude)
+
+    for split in ('lat', 'time'):
+        fields = ParallelEkmanExecutor(workers=2, split=split).run(u, v, latitude)
+        for field, values in fields.items():
+            assert np.array_equal(values, expected[field]), (split, field)
+
+
+def test_spiral_basis_cache():
+    """나선 깊이 기저 LRU 캐시의 적중/실패/제거 통계와 읽기 전용 배열 테스트"""
+    calculator = EkmanTransportCalculator(spiral_cache_size=2)
+    z_levels = np.linspace(0, 200, 50)
+    f30, f45, f60 = (calculator.calculate_coriolis_parameter(lat) for lat in (30, 45, 60))
+    first = calculator.calculate_ekman_spiral(z_levels, 0.1, 0.05, f30, calculator.K)
+    again = calculator.calculate_ekman_spiral(z_levels, 0.2, -0.1, f30, calculator.K)
+    assert np.allclose(again['u'], 2 * calculator.calculate_ekman_spiral(z_levels, 0.1, -0.05, f30, calculator.K)['u'])
+    assert calculator.spiral_basis_cache.info()['misses'] == 1 and calculator.spiral_basis_cache.info()['hits'] == 2
+
+    calculator.calculate_ekman_spiral(z_levels, 0.1, 0.05, f45, calculator.K)
+    calculator.calculate_ekman_spiral(z_levels, 0.1, 0.05, f60, calculator.K)
+    info = calculator.spiral_basis_cache.info()
+    assert info['currsize'] == 2 and info['evictions'] == 1 and info['misses'] == 3
+
+    basis = calculator._spiral_basis(z_levels, f60, calculator.K)
+    assert all(not array.flags.writeable for array in basis)
+    assert calculator._spiral_basis(z_levels, f60, calculator.K)[0] is basis[0]
+
+    # maxsize=0 이면 캐시하지 않고 같은 결과
+    uncached = EkmanTransportCalculator(spiral_cache_size=0)
+    spiral = uncached.calculate_ekman_spiral(z_levels, 0.1, 0.05, f30, uncached.K)
+    assert len(uncached.spiral_basis_cache) == 0
+    assert np.array_equal(spiral['u'], first['u']) and np.array_equal(spiral['v'], first['v'])
+
+
+def test_lazy_spiral():
+    """에크만 나선이 처음 접근할 때만 계산되는지 테스트"""
+    calculator = EkmanTransportCalculator()
+    results = calculator.calculate_ekman_transport(10, 45, 30, 200)
+    assert results['Mx'] != 0 and not results.is_computed('ekman_spiral')
+    assert calculator.spiral_basis_cache.info()['misses'] == 0
+
+    spiral = results['ekman_spiral']
+    assert results.is_computed('z_levels') and len(spiral['u']) == 50
+    surface_energy = results['tau_x'] * spiral['u'][0] + results['tau_y'] * spiral['v'][0]
+    assert results['energy_transfer_rate'] == surface_energy
+    assert set(results.copy()) == set(results.keys())
+    assert not hasattr(results, '__dict__')
+
+    records = to_records([results, calculator.calculate_ekman_transport(5, 90, -30, 100)])
+    assert records.dtype.names == RECORD_FIELDS and records.flags['C_CONTIGUOUS']
+    assert records['Mx'][0] == results.Mx and records[0] == results.to_numpy()
+
+    # 지연 항목은 결과 생성 시점의 설정으로 계산 (처음 접근 전에 계산기를 바꿔도 같은 값)
+    reference = EkmanTransportCalculator().calculate_ekman_transport(10, 45, 30, 200).to_dict()
+    changed = calculator.calculate_ekman_transport(10, 45, 30, 200)
+    calculator.rho_water = 2000
+    calculator.K = 0.05
+    calculator.dtype = np.float32
+    assert np.isclose(changed['energy_transfer_rate'], 0.02049, rtol=1e-3)
+    assert changed['energy_transfer_rate'] == reference['energy_transfer_rate']
+    for component in ('u', 'v'):
+        assert np.array_equal(changed['ekman_spiral'][component], reference['ekman_spiral'][component])
+        assert changed['ekman_spiral'][component].dtype == np.float64
+
+
+def test_adaptive_levels():
+    """명시적/로그/에크만 깊이 기준 격자와 e-folding 차단 테스트"""
+    calculator = EkmanTransportCalculator()
+    default = calculator.calculate_ekman_transport(10, 0, 70, 1000)
+    assert np.array_equal(default['z_levels'], np.linspace(0, 1000, 50))
+
+    results = calculator.calculate_ekman_transport(10, 0, 70, 1000, levels=20, level_mode='log', cutoff_tol=1e-3)
+    spiral = results['ekman_spiral']
+    assert len(results['z_levels']) == 20 and results['z_levels'][-1] < 1000
+    assert np.hypot(spiral['u'][-1], spiral['v'][-1]) <= 1.001e-3 * np.hypot(spiral['u'][0], spiral['v'][0])
+
+    results = calculator.calculate_ekman_transport(10, 0, 70, 1000, levels=[0, 5, 10, 40])
+    assert np.array_equal(results['z_levels'], [0, 5, 10, 40])
+
+    # 깊이 0 은 모드와 관계없이 0 격자
+    for mode in ('linear', 'log', 'ekman'):
+        assert np.array_equal(calculator.make_z_levels(0, 50.0, 10, mode), np.zeros(10))
+    for kwargs in ({'cutoff_tol': 1.0}, {'cutoff_tol': 2.0}, {'cutoff_tol': 0.0}, {'levels': 0}, {'levels': 1}):
+        try:
+            calculator.make_z_levels(1000, 50.0, **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"잘못된 격자 설정이 허용되었습니다: {kwargs}")
+
+
+def test_column_solver_matches_analytic():
+    """일정한 K에서 수치 해가 해석해와 일치하고 수송량이 보존되는지 테스트"""
+    calculator = EkmanTransportCalculator()
+    solver = EkmanColumnSolver(calculator)
+    latitude = np.array([30.0, -45.0, 60.0])
+    batch = calculator.calculate_ekman_transport_batch([10, 5, 20], [0, 45, 200], latitude, 0)
+    z_levels = np.linspace(0, 300, 3001)
+
+    columns = solver.solve(batch['tau_x'], batch['tau_y'], latitude, z_levels)
+    assert np.allclose(columns['Mx'], batch['Mx'], rtol=1e-10)
+    assert np.allclose(columns['My'], batch['My'], rtol=1e-10)
+    for i in range(3):
+        spiral = calculator.calculate_ekman_spiral(z_levels, batch['tau_x'][i], batch['tau_y'][i], batch['f'][i], calculator.K)
+        analytic = (1 + 1j * np.sign(batch['f'][i])) * (spiral['u'] + 1j * spiral['v'])
+        numeric = columns['u'][i] + 1j * columns['v'][i]
+        assert np.abs(numeric - analytic).max() < 1e-4 * np.abs(analytic).max()
+
+    varying = solver.solve(batch['tau_x'], batch['tau_y'], latitude, z_levels, K=lambda z: 0.01 + 0.05 * np.exp(-z / 20))
+    assert np.allclose(varying['Mx'], batch['Mx'], rtol=1e-10)
+
+
+def test_slab_exponential_integrator():
+    """지수 적분기가 일정 응력에 대한 해석해(관성 진동)를 큰 시간 간격에서도 재현하는지 테스트"""
+    calculator = EkmanTransportCalculator()
+    latitude = np.array([30.0, -45.0])
+    tau_x = np.full((48, 2), 0.1)
+    tau_y = np.full((48, 2), -0.05)
+
+    results = SlabEkmanModel(calculator, damping=0.0).integrate(tau_x, tau_y, latitude, dt=3 * 3600)
+    lam = -1j * calculator.calculate_coriolis_parameter(latitude)
+    t = 3 * 3600 * np.arange(1, 49)[:, np.newaxis]
+    exact = (1 - np.exp(-lam * t)) / lam * (0.1 - 0.05j) / calculator.rho_water
+    assert np.allclose(results['Mx'] + 1j * results['My'], exact, rtol=0, atol=1e-12 * np.abs(exact).max())
+
+
+def test_drag_formulations():
+    """항력 공식이 일괄 경로에 적용되고 경계값을 재현하는지 테스트"""
+    calculator = EkmanTransportCalculator()
+    wind_speed = np.array([5.0, 11.0, 20.0, 30.0, 40.0])
+    default = calculator.calculate_ekman_transport_batch(wind_speed, 30, 35, 100)
+
+    calculator.drag_formulation = ConstantDrag(calculator.Cd)
+    assert np.array_equal(calculator.calculate_ekman_transport_batch(wind_speed, 30, 35, 100)['Mx'], default['Mx'])
+
+    _, cd = LargePondDrag().coefficients(wind_speed, calculator.rho_air)
+    assert np.allclose(cd, [1.2e-3, 1.205e-3, 1.79e-3, 2.115e-3, 2.115e-3])
+    _, cd = SaturatingDrag().coefficients(wind_speed, calculator.rho_air)
+    assert cd[-1] == 2.34e-3
+
+    # 중립 성층(기온 = 해수면 온도)에서는 안정도 보정이 없어야 함
+    bulk = BulkStabilityDrag(air_temperature=20.0, sea_surface_temperature=20.0, pressure=101325.0)
+    rho_air, cd_bulk = bulk.coefficients(wind_speed, calculator.rho_air)
+    assert np.isclose(rho_air, 101325.0 / (287.05 * 293.15))
+    assert np.allclose(cd_bulk, SaturatingDrag().coefficients(wind_speed, calculator.rho_air)[1])
+
+    calculator.drag_formulation = bulk
+    typhoon = calculator.calculate_ekman_transport(30, 30, 35, 100)
+    assert typhoon['wind_stress'] > default['wind_stress'][3]
+
+
+def test_bulk_drag_chunked(tmp_path):
+    """격자 기온 장을 가진 벌크 공식이 타일/청크 단위 경로에서 전체 계산과 같은지 테스트"""
+    rng = np.random.default_rng(7)
+    latitude = np.linspace(-60, 60, 10)
+    u = rng.normal(0, 8, (5, 10, 12))
+    v = rng.normal(0, 8, (5, 10, 12))
+    calculator = EkmanTransportCalculator()
+    calculator.drag_formulation = BulkStabilityDrag(air_temperature=rng.uniform(0, 30, (10, 12)),
+                                                    sea_surface_temperature=20.0,
+                                                    pressure=rng.uniform(98000, 103000, (10, 12)))
+    engine = EkmanGridEngine(calculator)
+    expected = engine.compute(u, v, latitude)
+
+    out = TiledEkmanExecutor(engine, tile_shape=(2, 5, 12)).run(u, v, latitude, str(tmp_path / 'tiles'))
+    fields = ParallelEkmanExecutor(calculator, workers=1, split='lat').run(u, v, latitude)
+    executor = ParallelEkmanExecutor(calculator, workers=2, split='time')
+    with executor.make_pool() as pool:
+        pooled = [executor.run(u, v, latitude, pool=pool) for _ in range(2)]
+    for field in ('tau_x', 'tau_y', 'Mx', 'My'):
+        assert np.allclose(out[field], expected[field], rtol=1e-12, atol=0), field
+        assert np.allclose(fields[field], expected[field], rtol=1e-12, atol=0), field
+        for run in pooled:
+            assert np.allclose(run[field], expected[field], rtol=1e-12, atol=0), field
+
+    # 관측소 (시간, 관측소) 청크와 앙상블 블록
+    station_calculator = EkmanTransportCalculator()
+    station_calculator.drag_formulation = BulkStabilityDrag(air_temperature=rng.uniform(0, 30, (6, 4)),
+                                                            sea_surface_temperature=15.0)
+    stations = UpwellingStations([30.0, 35.0, -20.0, 45.0], [270.0, 0.0, 90.0, 180.0], calculator=station_calculator)
+    chunked = stations.compute(u[:, 0, :4].repeat(2, axis=0)[:6], v[:, 0, :4].repeat(2, axis=0)[:6], time_chunk=4)
+    whole = stations.compute(u[:, 0, :4].repeat(2, axis=0)[:6], v[:, 0, :4].repeat(2, axis=0)[:6], time_chunk=6)
+    assert np.allclose(chunked['upwelling_index'], whole['upwelling_index'], rtol=1e-12, atol=0)
+
+    wind_speed = np.hypot(u, v)[0]
+    parameters = {'K': np.array([0.005, 0.01, 0.02])}
+    blocks = EkmanEnsemble(calculator, block_elements=30).run(wind_speed, 45.0, latitude[:, np.newaxis],
+                                                              parameters=parameters)
+    single = EkmanEnsemble(calculator).run(wind_speed, 45.0, latitude[:, np.newaxis], parameters=parameters)
+    assert np.allclose(blocks['My']['mean'], single['My']['mean'], rtol=1e-12, atol=0)
+
+
+def test_equatorial_regularisation():
+    """적도 처리 모드에서 모든 위도의 값이 유한하고 밴드 밖은 기존 식과 같은지 테스트"""
+    calculator = EkmanTransportCalculator()
+    latitude = np.linspace(-10, 10, 81)
+    default = calculator.calculate_ekman_transport_batch(10, 30, latitude, 100)
+    outside = np.abs(latitude) >= calculator.equatorial_band
+
+    for mode in ('friction', 'beta'):
+        calculator.equatorial_mode = mode
+        batch = calculator.calculate_ekman_transport_batch(10, 30, latitude, 100)
+        for key in ('Mx', 'My', 'ekman_depth', 'energy_transfer_rate'):
+            assert np.all(np.isfinite(batch[key])), (mode, key)
+            assert np.allclose(batch[key][outside], default[key][outside], rtol=1e-14), (mode, key)
+        # 적도에서는 마찰만 남아 수송이 바람 방향과 같음
+        equator = np.argmin(np.abs(latitude))
+        assert np.isclose(np.arctan2(batch['My'][equator], batch['Mx'][equator]), np.radians(30))
+
+        # 스칼라 경로와 상사 평가기도 같은 적도 처리 (에너지는 정규화된 나선의 표층 속도와 일치)
+        evaluator = SimilarityEvaluator(calculator)
+        for i in (equator, equator + 4, equator + 10, equator - 20):
+            results = calculator.calculate_ekman_transport(10, 30, latitude[i], 100)
+            for key in ('Mx', 'My', 'ekman_depth', 'energy_transfer_rate'):
+                assert results[key] == batch[key][i], (mode, key)
+            spiral = results['ekman_spiral']
+            assert np.isclose(results['energy_transfer_rate'],
+                              results['tau_x'] * spiral['u'][0] + results['tau_y'] * spiral['v'][0], rtol=1e-14)
+            fast = evaluator.evaluate(10, 30, latitude[i], 100)
+            assert np.allclose(fast['ekman_spiral']['u'], spiral['u'], rtol=1e-12, atol=1e-15), mode
+            assert np.isclose(fast['My'], results['My'], rtol=1e-12), mode
+
+        # 연직 기둥 해법(free-slip)의 이산 수송량도 같은 정규화 식과 일치
+        column = EkmanColumnSolver(calculator).solve(batch['tau_x'], batch['tau_y'], latitude, np.linspace(0, 100, 60))
+        assert np.all(np.isfinite(column['u'])) and np.all(np.isfinite(column['v'])), mode
+        assert np.allclose(column['Mx'], batch['Mx'], rtol=1e-10) and np.allclose(column['My'], batch['My'], rtol=1e-10), mode
+
+
+def test_float32_compute_mode():
+    """float32 계산 모드가 정밀도를 유지하고 float64 대비 오차 한계 이내인지 테스트"""
+    calc64 = EkmanTransportCalculator()
+    calc32 = EkmanTransportCalculator()
+    calc32.dtype = np.float32
+    rng = np.random.default_rng(1)
+    wind_speed = rng.uniform(0.5, 30, 500)
+    wind_direction = rng.uniform(0, 360, 500)
+    latitude = rng.uniform(-80, 80, 500)
+
+    batch64 = calc64.calculate_ekman_transport_batch(wind_speed, wind_direction, latitude, 100)
+    batch32 = calc32.calculate_ekman_transport_batch(wind_speed, wind_direction, latitude, 100)
+    magnitude = np.hypot(batch64['Mx'], batch64['My'])
+    for key in ('Mx', 'My'):
+        assert batch32[key].dtype == np.float32
+        assert np.all(np.abs(batch32[key] - batch64[key]) <= FLOAT32_RTOL * magnitude)
+
+    u = rng.normal(0, 8, (3, 20, 30))
+    v = rng.normal(0, 8, (3, 20, 30))
+    grid_latitude = np.linspace(-60, 60, 20)
+    grid32 = EkmanGridEngine(calc32).compute(u, v, grid_latitude)
+    grid64 = EkmanGridEngine(calc64).compute(u, v, grid_latitude)
+    for key in grid64:
+        assert grid32[key].dtype == np.float32, key
+        assert np.allclose(grid32[key], grid64[key], rtol=FLOAT32_RTOL, atol=FLOAT32_RTOL * np.abs(grid64[key]).max()), key
+
+    results32 = calc32.calculate_ekman_transport(10, 30, 45, 200)
+    assert results32['z_levels'].dtype == np.float32
+    for mode in ('linear', 'log', 'ekman'):
+        assert calc32.make_z_levels(200, 50.0, 20, mode).dtype == np.float32, mode
+    assert calc32.make_z_levels(200, 50.0, [0, 10, 50]).dtype == np.float32
+    spiral32 = results32.ekman_spiral
+    spiral64 = calc64.calculate_ekman_transport(10, 30, 45, 200).ekman_spiral
+    surface = np.hypot(spiral64['u'][0], spiral64['v'][0])
+    for key in ('u', 'v'):
+        assert spiral32[key].dtype == np.float32
+        assert np.all(np.abs(spiral32[key] - spiral64[key]) <= FLOAT32_RTOL * surface)
+
+
+def test_ensemble_matches_loop():
+    """앙상블 통계가 상수를 바꿔가며 반복 계산한 결과와 같은지 테스트"""
+    ensemble = EkmanEnsemble(block_elements=100)
+    parameters = ensemble.sample_parameters(50, seed=0)
+    wind_speed = np.array([5.0, 10.0, 20.0])
+    latitude = np.array([[-30.0], [45.0]])
+    stats = ensemble.run(wind_speed, 30, latitude, 100, parameters=parameters)
+
+    samples = []
+    for i in range(50):
+        calculator = EkmanTransportCalculator()
+        for name, values in parameters.items():
+            setattr(calculator, name, values[i])
+        samples.append(calculator.calculate_ekman_transport_batch(wind_speed, 30, latitude, 100)['My'])
+    samples = np.array(samples)
+
+    assert stats['My']['mean'].shape == (2, 3)
+    assert np.allclose(stats['My']['mean'], samples.mean(axis=0))
+    assert np.allclose(stats['My']['std'], samples.std(axis=0, ddof=1))
+    assert np.allclose(stats['My']['quantiles'], np.quantile(samples, (0.05, 0.5, 0.95), axis=0))
+
+
+def test_transport_sensitivities():
+    """해석적 편미분이 중앙 차분과 같은지 테스트"""
+    wind_speed = np.array([3.0, 10.0, 25.0])
+    wind_direction = np.array([10.0, 135.0, 280.0])
+    latitude = np.array([-40.0, 2.0, 60.0])
+    steps = {'wind_speed': 1e-4, 'wind_direction': 1e-4, 'latitude': 1e-5, 'Cd': 1e-8, 'K': 1e-6}
+
+    for mode in (None, 'friction'):
+        calculator = EkmanTransportCalculator()
+        calculator.equatorial_mode = mode
+        batch = calculator.calculate_ekman_transport_batch(wind_speed, wind_direction, latitude, 100, sensitivities=True)
+        for name, h in steps.items():
+            shifted = []
+            for sign in (1, -1):
+                perturbed = EkmanTransportCalculator()
+                perturbed.equatorial_mode = mode
+                inputs = {'wind_speed': wind_speed, 'wind_direction': wind_direction, 'latitude': latitude}
+                if name in inputs:
+                    inputs[name] = inputs[name] + sign * h
+                else:
+                    setattr(perturbed, name, getattr(perturbed, name) + sign * h)
+                shifted.append(perturbed.calculate_ekman_transport_batch(depth=100, **inputs))
+            for key in ('Mx', 'My', 'ekman_depth'):
+                finite_difference = (shifted[0][key] - shifted[1][key]) / (2 * h)
+                scale = np.abs(finite_difference).max() + 1e-12
+                assert np.allclose(batch[f'd{key}_d{name}'], finite_difference, atol=1e-6 * scale), (mode, key, name)
+
+
+def test_sweep_cube(tmp_path):
+    """매개변수 스윕 큐브가 스칼라 계산과 같고 청크 저장 결과가 일치하는지 테스트"""
+    wind_speed = np.linspace(1, 30, 4)
+    wind_direction = np.arange(0, 360, 90.0)
+    latitude = np.linspace(-60, 60, 5)
+    sweep = EkmanSweep(wind_speed, wind_direction, latitude, [50, 100], max_bytes=2000)
+    cube = sweep.compute()
+    assert cube['Mx'].shape == (4, 4, 5, 2)
+
+    calculator = EkmanTransportCalculator()
+    scalar = calculator.calculate_ekman_transport(wind_speed[2], wind_direction[1], latitude[3], 100)
+    assert np.isclose(cube['My'][2, 1, 3, 1], scalar['My'])
+    assert np.isclose(cube.sel(latitude=latitude[3], depth=100)['ekman_depth'][2, 1], scalar['ekman_depth'])
+    assert cube.to_dataframe().shape == (sweep.size, len(sweep.fields))
+
+    sweep.to_npz(str(tmp_path / 'sweep.npz'))
+    cube.to_npz(str(tmp_path / 'cube.npz'))
+    streamed = np.load(tmp_path / 'sweep.npz')
+    in_memory = np.load(tmp_path / 'cube.npz')
+    assert sorted(streamed.files) == sorted(in_memory.files)
+    for key in streamed.files:
+        assert np.array_equal(streamed[key], in_memory[key])
+
+    sweep.to_csv(tmp_path / 'sweep.csv')
+    table = np.loadtxt(tmp_path / 'sweep.csv', delimiter=',', skiprows=1)
+    assert table.shape == (sweep.size, 4 + len(sweep.fields))
+
+
+def test_inverse_round_trip():
+    """역계산한 바람이 목표 수송량을 만드는 원래 바람과 같은지 테스트"""
+    rng = np.random.default_rng(2)
+    wind_speed = rng.uniform(0.5, 45, 200)
+    wind_direction = rng.uniform(0, 360, 200)
+    latitude = rng.uniform(-70, 70, 200)
+
+    for drag in (None, SaturatingDrag(), BulkStabilityDrag(rng.uniform(5, 25, 200), 15.0)):
+        calculator = EkmanTransportCalculator()
+        calculator.drag_formulation = drag
+        batch = calculator.calculate_ekman_transport_batch(wind_speed, wind_direction, latitude, 100)
+        inverse = EkmanInverseSolver(calculator).solve(batch['Mx'], batch['My'], latitude)
+        assert np.all(inverse['converged'])
+        assert np.allclose(inverse['wind_speed'], wind_speed, rtol=1e-8)
+        assert np.allclose((inverse['wind_direction'] - wind_direction + 180) % 360 - 180, 0, atol=1e-9)
+
+
+def test_netcdf_reader(tmp_path):
+    """NetCDF3 파일의 청크 단위 계산이 전체 격자 계산과 같은지 테스트"""
+    from scipy.io import netcdf_file
+
+    rng = np.random.default_rng(3)
+    u = rng.normal(0, 8, (5, 6, 8))
+    v = rng.normal(0, 8, (5, 6, 8))
+    path = tmp_path / 'wind.nc'
+    dataset = netcdf_file(path, 'w')
+    dataset.createDimension('time', None)
+    dataset.createDimension('lat', 6)
+    dataset.createDimension('lon', 8)
+    dataset.createVariable('time', 'f8', ('time',))[:] = np.arange(5)
+    dataset.createVariable('lat', 'f4', ('lat',))[:] = np.linspace(60, -60, 6)
+    dataset.createVariable('lon', 'f4', ('lon',))[:] = np.arange(8) * 45
+    packed_u = dataset.createVariable('u10', 'i2', ('time', 'lat', 'lon'))
+    packed_u.scale_factor = 0.01
+    packed_u[:] = np.round(u / 0.01).astype('i2')
+    dataset.createVariable('v10', 'f8', ('time', 'lat', 'lon'))[:] = v
+    dataset.close()
+
+    with NetCDFWindReader(path) as reader:
+        assert reader.shape == (5, 6, 8)
+        chunks = list(reader.iter_ekman(time_chunk=2))
+        latitude = reader.latitude
+    assert [window for window, _ in chunks] == [slice(0, 2), slice(2, 4), slice(4, 5)]
+    expected = EkmanGridEngine().compute(np.round(u / 0.01) * 0.01, v, latitude)
+    assert np.allclose(np.concatenate([fields['My'] for _, fields in chunks]), expected['My'])
+
+
+def test_streaming_writers(tmp_path):
+    """백그라운드 기록기(NPZ 샤드, 메모리 매핑, CSV)의 결과가 원래 청크와 같은지 테스트"""
+    rng = np.random.default_rng(4)
+    latitude = np.linspace(-60, 60, 6)
+    engine = EkmanGridEngine()
+    chunks = [engine.compute(rng.normal(0, 8, (2, 6, 8)), rng.normal(0, 8, (2, 6, 8)), latitude) for _ in range(4)]
+    expected = np.concatenate([chunk['Mx'] for chunk in chunks])
+
+    with NPZShardWriter(tmp_path / 'npz', fields=('Mx', 'My'), shard_bytes=1000) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    assert len(writer.paths) > 1
+    assert np.array_equal(np.concatenate([np.load(path)['Mx'] for path in writer.paths]), expected)
+
+    with MemmapWriter(tmp_path / 'npy', expected.shape, fields=('Mx',)) as writer:
+        for i, chunk in enumerate(reversed(chunks)):
+            writer.write(chunk, index=slice(6 - 2 * i, 8 - 2 * i))
+    assert np.array_equal(np.load(tmp_path / 'npy' / 'Mx.npy'), expected)
+
+    with CSVWriter(tmp_path / 'out.csv', fields=('Mx', 'My')) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    table = np.loadtxt(tmp_path / 'out.csv', delimiter=',', skiprows=1)
+    assert np.allclose(table[:, 0], expected.reshape(-1))
+
+
+def test_upwelling_index():
+    """용승 지수가 물리적 에크만 수송 (-Mx, -My) 의 외해 법선 투영과 같은지 테스트"""
+    stations = UpwellingStations.from_coastline([34.0, 35.1, -33.0], [315.0, 45.0, 90.0],
+                                                names=['Los Angeles', 'Busan', 'Valparaiso'])
+    assert np.allclose(stations.offshore_direction, [225.0, 315.0, 0.0])
+
+    rng = np.random.default_rng(5)
+    wind_speed = rng.uniform(0, 15, (7, 3))
+    wind_direction = rng.uniform(0, 360, (7, 3))
+    index = stations.compute_from_speed_direction(wind_speed, wind_direction, time_chunk=3)
+
+    batch = EkmanTransportCalculator().calculate_ekman_transport_batch(wind_speed, wind_direction, stations.latitude, 100)
+    normal = np.radians(stations.offshore_direction)
+    offshore = -(batch['Mx'] * np.cos(normal) + batch['My'] * np.sin(normal))
+    assert np.allclose(index['offshore_transport'], offshore)
+    assert np.allclose(index['upwelling_index'], 100 * offshore)
+    assert np.allclose(index['offshore_transport'] ** 2 + index['alongshore_transport'] ** 2,
+                       batch['Mx'] ** 2 + batch['My'] ** 2)
+
+    # 적도 쪽으로 부는 연안 바람은 용승 (로스앤젤레스: 남동쪽 315°, 칠레: 북쪽 90° 로 향하는 바람)
+    favourable = UpwellingStations.from_coastline([34.0, -33.0], [315.0, 270.0])
+    upwelling = favourable.compute_from_speed_direction(np.full((1, 2), 10.0), np.array([[315.0, 90.0]]))
+    assert np.all(upwelling['upwelling_index'] > 0)
+    assert np.isclose(upwelling['upwelling_index'][0, 0], 190.5, rtol=1e-3)
+
+
+def test_upwelling_accumulator(tmp_path):
+    """누적기를 저장/복원하며 갱신한 결과가 전체 기록 재계산과 같은지 테스트"""
+    rng = np.random.default_rng(6)
+    stations = UpwellingStations(rng.uniform(20, 50, 4), rng.uniform(0, 360, 4))
+    u = rng.normal(0, 6, (60, 4))
+    v = rng.normal(0, 6, (60, 4))
+    u[5, 1] = np.nan
+    index = stations.compute(u, v)['upwelling_index']
+
+    accumulator = UpwellingAccumulator(stations, window=12, dt=3600.0)
+    for t in range(25):
+        accumulator.update(u[t], v[t])
+    accumulator.save(tmp_path / 'state.npz')
+    resumed = UpwellingAccumulator.load(tmp_path / 'state.npz')
+    resumed.update(u[25:], v[25:])
+
+    assert resumed.count == 60
+    assert np.allclose(resumed.cumulative, np.nansum(index, axis=0) * 3600.0)
+    assert np.allclose(resumed.rolling_mean, np.nanmean(index[-12:], axis=0))
+
+    # 기본값이 아닌 계산기로 저장한 상태는 같은 설정의 계산기로만 복원
+    calculator = EkmanTransportCalculator()
+    calculator.drag_formulation = SaturatingDrag()
+    calculator.equatorial_mode = 'friction'
+    custom = UpwellingAccumulator(UpwellingStations([30.0, -5.0], [90.0, 270.0], calculator=calculator))
+    custom.update(u[0, :2], v[0, :2])
+    custom.save(tmp_path / 'custom.npz')
+    same = EkmanTransportCalculator()
+    same.drag_formulation = SaturatingDrag()
+    same.equatorial_mode = 'friction'
+    assert UpwellingAccumulator.load(tmp_path / 'custom.npz', calculator=same).count == 1
+    same.drag_formulation.cd_max = 2.0e-3
+    for other in (None, same):
+        try:
+            UpwellingAccumulator.load(tmp_path / 'custom.npz', calculator=other)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("다른 계산기 설정으로 체크포인트가 복원되었습니다")
+
+
+def test_similarity_matches_direct():
+    """단위 응력 해의 스케일/회전이 직접 계산과 같은지 테스트"""
+    drag_calculator = EkmanTransportCalculator()
+    drag_calculator.drag_formulation = LargePondDrag()
+    for calculator in (EkmanTransportCalculator(), drag_calculator):
+        evaluator = SimilarityEvaluator(calculator)
+        for latitude in (0.0, 30.0, -45.0):
+            for wind_speed, wind_direction in ((3.0, 10.0), (12.0, 135.0), (25.0, 290.0)):
+                fast = evaluator.evaluate(wind_speed, wind_direction, latitude, 200.0).to_dict()
+                direct = calculator.calculate_ekman_transport(wind_speed, wind_direction, latitude, 200.0).to_dict()
+                for key in ('Mx', 'My', 'ekman_depth', 'energy_transfer_rate', 'z_levels'):
+                    assert np.allclose(fast[key], direct[key], rtol=1e-12, atol=0)
+                for key in ('u', 'v'):
+                    assert np.allclose(fast['ekman_spiral'][key], direct['ekman_spiral'][key], rtol=1e-12, atol=1e-15)
+        # (위도, 깊이) 마다 단위 해는 한 번만 계산
+        assert len(evaluator.unit_cache) == 3
+
+
+def test_cache_thread_safety():
+    """여러 스레드가 공유하는 LRU 캐시와 상사 평가기 테스트"""
+    cache = LRUCache(maxsize=1)
+    writers = []
+
+    class InterleavingDict(OrderedDict):
+        """조회 직후(move_to_end 전)에 다른 스레드의 put() 을 끼워 넣는 저장소"""
+
+        def __getitem__(self, key):
+            value = super().__getitem__(key)
+            # 잠금이 없으면 이 put() 이 키를 제거하여 move_to_end 가 KeyError
+            writer = threading.Thread(target=cache.put, args=('other', 0))
+            writer.start()
+            writer.join(timeout=0.2)
+            writers.append(writer)
+            return value
+
+    cache.put('key', 'value')
+    cache._data = InterleavingDict(cache._data)
+    assert cache.get('key') == 'value'
+    writers[0].join()
+    assert 'other' in cache and cache.info()['evictions'] == 1
+
+    evaluator = SimilarityEvaluator()
+    expected = [evaluator.calculator.calculate_ekman_transport(10.0, 45.0, latitude, 100.0).My
+                for latitude in range(10, 70, 5)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda latitude: evaluator.evaluate(10.0, 45.0, latitude, 100.0).My,
+                                list(range(10, 70, 5)) * 4))
+    assert np.allclose(results, expected * 4, rtol=1e-12)
+
+
+def test_memoized_calculator():
+    """양자화 키 캐시의 적중/제거 통계와 결과 불변성 테스트"""
+    memo = MemoizedEkmanCalculator()
+    result = memo.calculate_ekman_transport(10.04, 359.7, 30.02, 100.3)
+    assert memo.calculate_ekman_transport(9.96, 0.2, 29.98, 99.8) is result
+    assert memo.cache_info()['hits'] == 1 and memo.cache_info()['misses'] == 1
+
+    direct = memo.calculator.calculate_ekman_transport(10.0, 0.0, 30.0, 100.0)
+    assert np.isclose(result.Mx, direct.Mx) and np.allclose(result.ekman_spiral['u'], direct.ekman_spiral['u'])
+    for mutate in (lambda: setattr(result, 'Mx', 0.0), lambda: result.z_levels.__setitem__(0, 1.0),
+                   lambda: result.ekman_spiral['u'].__setitem__(0, 1.0)):
+        try:
+            mutate()
+        except (AttributeError, ValueError):
+            pass
+        else:
+            raise AssertionError("캐시된 결과가 변경되었습니다")
+
+    # 바이트 제한: 결과 두 개만 들어가는 크기
+    small = MemoizedEkmanCalculator(maxbytes=2 * memo.cache_info()['currbytes'])
+    for wind_speed in (5.0, 6.0, 7.0, 8.0):
+        small.calculate_ekman_transport(wind_speed, 45.0, 30.0, 100.0)
+    info = small.cache_info()
+    assert info['currsize'] == 2 and info['evictions'] == 2 and info['currbytes'] <= info['maxbytes']
+
+    # 항력 공식은 객체 id 가 아닌 매개변수로 키를 구별
+    memo.calculator.drag_formulation = SaturatingDrag()
+    saturating = memo.calculate_ekman_transport(40.0, 0.0, 30.0, 100.0)
+    memo.calculator.drag_formulation.cd_max = 2.0e-3
+    assert memo.calculate_ekman_transport(40.0, 0.0, 30.0, 100.0).wind_stress < saturating.wind_stress
+    memo.calculator.drag_formulation = SaturatingDrag()
+    assert memo.calculate_ekman_transport(40.0, 0.0, 30.0, 100.0) is saturating
+
+    # 격자 항력 공식의 배열은 매개변수가 바뀔 때만 다시 해시 (적중마다 해시하지 않음)
+    rng = np.random.default_rng(8)
+    memo.calculator.drag_formulation = BulkStabilityDrag(air_temperature=rng.uniform(0, 30, (200, 300)),
+                                                         sea_surface_temperature=20.0)
+    signature = memo.calculator.settings()['drag_formulation']
+    digests = []
+
+    def counting_sha1():
+        digests.append(1)
+        return hashlib.sha1()
+
+    ekman_drag.hashlib = type('CountingHashlib', (), {'sha1': staticmethod(counting_sha1)})
+    try:
+        for _ in range(3):
+            assert memo.calculator.settings()['drag_formulation'] == signature
+        assert not digests
+        memo.calculator.drag_formulation.neutral.cd_max = 2.0e-3
+        assert memo.calculator.settings()['drag_formulation'] != signature and digests
+    finally:
+        ekman_drag.hashlib = hashlib
+
+
 if __name__ == "__main__":
-    test_ekman_calculations() 
\ No newline at end of file
+    test_ekman_calculations()
+    test_batch_matches_scalar()
+    test_grid_matches_scalar()
+    test_spherical_curl()
+    test_parallel_matches_serial()
+    test_spiral_basis_cache()
+    test_lazy_spiral()
+    test_adaptive_levels()
+    test_column_solver_matches_analytic()
+    test_slab_exponential_integrator()
+    test_drag_formulations()
+    test_equatorial_regularisation()
+    test_float32_compute_mode()
+    test_ensemble_matches_loop()
+    test_transport_sensitivities()
+    test_inverse_round_trip()
+    test_upwelling_index()
+    test_similarity_matches_direct()
+    test_cache_thread_safety()
+    test_memoized_calculator()